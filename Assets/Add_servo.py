@@ -1,5 +1,5 @@
 import os
-import json
+import sys
 import shutil
 import customtkinter as ctk
 from tkinter import filedialog as fd
@@ -13,8 +13,14 @@ ctk.set_default_color_theme("dark-blue")
 script_dir = os.path.dirname(os.path.abspath(__file__))  # pasta do Add_servo.py
 repo_dir   = os.path.dirname(script_dir)                 # pasta raiz do repositório
 
+sys.path.insert(0, repo_dir)
+from servo_catalog import journal
+from servo_catalog.schema import normalize_record
+from servo_catalog.store import CatalogStore
+
 # Diretórios de destino
 JSON_PATH   = os.path.join(repo_dir, "Database", "servos.json")   # <-- Agora é JSON
+DB_PATH     = os.path.join(repo_dir, "Database", "servos.db")     # usado se existir
 IMAGES_DIR  = os.path.join(repo_dir, "Database", "Images")
 DATASHEETS_DIR = os.path.join(repo_dir, "Database", "Datasheets")
 
@@ -325,28 +331,18 @@ class ServoRegistrationApp(ctk.CTk):
             "Link":            self.entry_link.get().strip()
         }
 
-        # Carrega (ou cria) o JSON
-        data = {"servos": []}  # estrutura inicial
-        if os.path.exists(JSON_PATH):
+        # Números como números, ausentes como null (esquema v2)
+        servo_dict = normalize_record(servo_dict)
+
+        if os.path.exists(DB_PATH):
+            # Banco SQLite: um INSERT, sem reescrever o catálogo
             try:
-                with open(JSON_PATH, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    # Esperamos que data tenha a chave "servos" como lista
-                    if "servos" not in data:
-                        data["servos"] = []
+                with CatalogStore(DB_PATH) as store:
+                    store.insert(servo_dict)
             except Exception as e:
-                messagebox.showerror("Erro", f"Falha ao ler JSON:\n{e}")
+                messagebox.showerror("Erro", f"Falha ao gravar no banco:\n{e}")
                 return
-
-        # Adiciona o novo servo
-        data["servos"].append(servo_dict)
-
-        # Salva de volta no JSON
-        try:
-            with open(JSON_PATH, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            messagebox.showerror("Erro", f"Falha ao escrever JSON:\n{e}")
+        elif not self.append_to_json(servo_dict):
             return
 
         # Substitui espaços por underscores no nome do modelo ao salvar os arquivos
@@ -374,6 +370,18 @@ class ServoRegistrationApp(ctk.CTk):
         # Mensagem de sucesso
         messagebox.showinfo("Sucesso", "Servo cadastrado com sucesso!")
 
+    def append_to_json(self, servo_dict):
+        """
+        Sem o banco SQLite: acrescenta uma linha ao diário do servos.json
+        (o launcher junta base + diário e compacta de tempos em tempos).
+        """
+        try:
+            journal.append(JSON_PATH, servo_dict)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Falha ao escrever JSON:\n{e}")
+            return False
+        return True
+
     def clear_fields(self):
         self.entry_make.delete(0, "end")
         self.entry_model.delete(0, "end")
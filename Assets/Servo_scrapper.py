@@ -1,5 +1,6 @@
 import os
 import re
+import sys
 import json
 import requests
 import customtkinter as ctk
@@ -19,6 +20,10 @@ repo_dir = os.path.dirname(BASE_DIR)
 DATABASE_DIR = os.path.join(repo_dir, "Database", "Data")
 os.makedirs(DATABASE_DIR, exist_ok=True)
 
+sys.path.insert(0, repo_dir)
+from servo_catalog.merge import merge_records
+from servo_catalog.schema import SCHEMA_VERSION, write_document
+
 class HTMLDownloaderApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -782,6 +787,7 @@ class HTMLDownloaderApp(ctk.CTk):
 
         from bs4 import BeautifulSoup
 
+        scraped = []
         for file in html_files:
             full_path = os.path.join(servo_dir, file)
             with open(full_path, "r", encoding="utf-8") as f:
@@ -840,14 +846,19 @@ class HTMLDownloaderApp(ctk.CTk):
             # Agora chamamos a função de formatação
             final_servo = self.transform_servo_dict(raw_dict, self.selected_site)
 
-            # Adiciona ao data
-            data["servos"].append(final_servo)
+            scraped.append(final_servo)
+
+        # Upsert por (Make, Model): rodar o garimpo de novo não duplica os servos
+        records, counts = merge_records(data["servos"], scraped)
 
         # Salva no servos.json
         try:
-            with open(saved_json, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            self.show_scary_alert("Sucesso", f"Garimpo de servos concluído!\nSalvo em {saved_json}")
+            write_document(saved_json, {"schema_version": SCHEMA_VERSION, "servos": records})
+            self.show_scary_alert(
+                "Sucesso",
+                f"Garimpo de servos concluído!\nSalvo em {saved_json}\n"
+                f"{counts['inserted']} novos, {counts['updated']} atualizados, {counts['unchanged']} iguais."
+            )
         except Exception as e:
             self.show_scary_alert("Erro", f"Falha ao salvar JSON: {e}")
 
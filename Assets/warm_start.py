@@ -0,0 +1,74 @@
+"""
+Interpretador "pré-aquecido" para os programas do launcher.
+
+O main.py deixa um destes processos aberto em segundo plano: ele importa
+de antemão os módulos pesados que os programas de Assets usam (matplotlib,
+scipy, numpy, pandas, customtkinter...) e fica esperando. Ao clicar num
+botão, o launcher manda uma linha JSON pelo stdin:
+
+    {"script": "Assets/vizual_mola.py", "argv": ["--COM7"]}
+
+e o script roda neste mesmo processo como __main__ (runpy), sem pagar os
+imports de novo. Depois do primeiro pedido o processo é só aquele programa:
+stdin/stdout continuam ligados ao console de debug normalmente.
+
+Funciona igual no Windows (não usa fork). Um módulo ausente no pré-carregamento
+é só pulado; o script dá o erro normal se precisar dele.
+
+    python Assets/warm_start.py [--announce]
+--announce imprime "WARM_READY <ms>" ao terminar os imports (benchmarks).
+"""
+import os
+import sys
+import json
+import time
+import runpy
+import importlib
+
+# Módulos pesados em comum entre vizual_*.py, controle.py, Plot.py, Add_servo.py e Servo_scrapper.py
+PRELOAD_MODULES = (
+    "numpy",
+    "matplotlib",
+    "matplotlib.pyplot",
+    "matplotlib.widgets",
+    "matplotlib.patches",
+    "matplotlib.ticker",
+    "mpl_toolkits.mplot3d",
+    "scipy.optimize",
+    "pandas",
+    "customtkinter",
+    "PIL.Image",
+    "serial",
+    "requests",
+)
+
+def preload(modules=PRELOAD_MODULES):
+    """Importa o que estiver instalado; retorna os módulos que faltaram."""
+    missing = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            missing.append(name)
+    return missing
+
+def main():
+    t0 = time.perf_counter()
+    preload()
+    if "--announce" in sys.argv[1:]:
+        print(f"WARM_READY {(time.perf_counter() - t0) * 1e3:.0f}", flush=True)
+
+    line = sys.stdin.readline()
+    if not line.strip():
+        return 0  # launcher fechou sem usar este processo
+    job = json.loads(line)
+    script = job["script"]
+
+    # Mesmo ambiente de "python <script> <args>"
+    sys.argv = [script] + list(job.get("argv", []))
+    sys.path[0] = os.path.dirname(os.path.abspath(script))
+    runpy.run_path(script, run_name="__main__")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
 import csv
-import json
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from servo_catalog.schema import make_document, write_document
 
 def csv_to_json(csv_path, json_path):
-    data = {"servos": []}
+    rows = []
 
     with open(csv_path, "r", encoding="utf-8") as f:
         # Lê a primeira linha
@@ -15,11 +18,10 @@ def csv_to_json(csv_path, json_path):
         
         reader = csv.DictReader(f, delimiter=",")
         for row in reader:
-            data["servos"].append(row)
+            rows.append(row)
 
-    # Salva o JSON
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Salva o JSON já tipado (números, null para ausentes, curvas em listas)
+    write_document(json_path, make_document(rows))
 
 def main():
     csv_file = "servos.csv"    # Ajuste o caminho se necessário
@@ -1,42 +1,27 @@
-import json
+import os
+import sys
+import numpy as np
 import matplotlib.pyplot as plt
 
-def plot_servo_torque_vs_weight(json_file_path):
-    # 1) Ler o arquivo JSON
-    with open(json_file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # 2) Extrair os valores de peso (em kg) e torque (em kgf.cm)
-    weights_kg = []
-    torques_kgfcm = []
-    labels = []
+# Permite importar o pacote servo_catalog (raiz do repositório)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from servo_catalog import load_catalog
 
-    # Percorrer cada servo no JSON
-    for servo in data["servos"]:
-        # Converter peso de gramas para kg
-        try:
-            weight_g = float(servo["Weight (g)"])
-        except ValueError:
-            # Se estiver vazio ou inválido, ignorar
-            continue
+def plot_servo_torque_vs_weight(json_file_path):
+    # 1) Carregar o catálogo (usa o cache binário ao lado do JSON, se válido)
+    catalog = load_catalog(json_file_path)
 
-        weight_kg = weight_g / 1000.0
-        
-        # Ler o torque1 (kgf.cm)
-        # (vamos assumir que TensãoTorque1 e Torque1 (kgf.cm) são os valores principais)
-        torque_str = servo["Torque1 (kgf.cm)"]
-        if torque_str:
-            try:
-                torque_kgfcm = float(torque_str)
-            except ValueError:
-                # Se estiver vazio ou inválido, ignorar
-                continue
+    # 2) Extrair os valores de peso (em kg) e torque (em kgf.cm)
+    # (vamos assumir que TensãoTorque1 e Torque1 (kgf.cm) são os valores principais)
+    weight_g = catalog.columns["weight"]
+    torque1 = catalog.slots["torque"][:, 0]
 
-            # Armazenar nos vetores
-            weights_kg.append(weight_kg)
-            torques_kgfcm.append(torque_kgfcm)
-            # Guardar algum rótulo para identificar no gráfico
-            labels.append(f"{servo['Model']}")
+    # Servos sem peso ou sem torque1 válidos são ignorados
+    idx = np.flatnonzero(catalog.valid["weight"] & ~np.isnan(torque1))
+    weights_kg = weight_g[idx] / 1000.0
+    torques_kgfcm = torque1[idx]
+    # Guardar algum rótulo para identificar no gráfico
+    labels = [catalog.record(i)["Model"] for i in idx]
     
     # 3) Plotar o gráfico de dispersão
     plt.figure(figsize=(8, 6))
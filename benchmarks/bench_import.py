@@ -0,0 +1,53 @@
+"""
+Tempo de importação do servo_catalog (API sem interface) num interpretador
+novo. Falha (código 1) se a mediana passar de IMPORT_BUDGET_MS ou se o
+import puxar algum módulo de interface/hardware.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_import.py
+"""
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+IMPORT_BUDGET_MS = 200
+RUNS = 7
+FORBIDDEN = ("tkinter", "customtkinter", "serial", "icrawler", "requests", "PIL")
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys, time, json
+t0 = time.perf_counter()
+import servo_catalog
+dt = (time.perf_counter() - t0) * 1e3
+print(json.dumps({"ms": dt, "modules": sorted(m.split(".")[0] for m in sys.modules)}))
+"""
+
+def measure():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=repo_dir, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out)
+
+def main():
+    results = [measure() for _ in range(RUNS)]
+    times = [r["ms"] for r in results]
+    median = statistics.median(times)
+    leaked = sorted(set(FORBIDDEN) & set(results[-1]["modules"]))
+
+    print(f"import servo_catalog: mediana {median:.1f} ms (mín {min(times):.1f}, máx {max(times):.1f}) "
+          f"em {RUNS} execuções; limite {IMPORT_BUDGET_MS} ms")
+    ok = True
+    if median > IMPORT_BUDGET_MS:
+        print(f"[FALHA] acima do limite de {IMPORT_BUDGET_MS} ms")
+        ok = False
+    if leaked:
+        print(f"[FALHA] o import carregou módulos de interface/hardware: {', '.join(leaked)}")
+        ok = False
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
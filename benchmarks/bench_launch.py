@@ -0,0 +1,108 @@
+"""
+Latência de abertura dos programas do launcher: "python <script>" (frio)
+contra o interpretador pré-aquecido do Assets/warm_start.py (quente).
+
+Para cada programa mede o tempo até os imports do topo do script terminarem
+(é o que o warm_start.py economiza; figuras e janelas custam igual nos dois
+casos). Os imports vêm do próprio script (AST) e rodam num script-sonda; um
+módulo que não esteja instalado nesta máquina é pulado e aparece na coluna
+"ausentes".
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_launch.py [--runs 3]
+"""
+import os
+import ast
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WARM_START = os.path.join(repo_dir, "Assets", "warm_start.py")
+
+TOOLS = {
+    "MOLA": "vizual_mola.py",
+    "PESO": "vizual_peso.py",
+    "AVIAO": "vizual_aviao.py",
+    "CONTROLE": "controle.py",
+    "CADASTRO": "Add_servo.py",
+    "SCRAPPER": "Servo_scrapper.py",
+}
+
+def probe_source(script_path):
+    """Script que só executa os imports do topo de `script_path` e lista os que falharam."""
+    with open(script_path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    lines = ["missing = []"]
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            stmt = ast.unparse(node)
+            lines.append(f"try:\n    {stmt}\nexcept Exception:\n    missing.append({stmt!r})")
+    lines.append("import json\nprint('PROBE_DONE ' + json.dumps(missing), flush=True)")
+    return "\n".join(lines) + "\n"
+
+def run_env():
+    # Os scripts de Assets acham o servo_catalog pela raiz do repositório
+    return {**os.environ, "PYTHONPATH": repo_dir, "PYTHONUNBUFFERED": "1"}
+
+def read_until(process, prefix):
+    for line in process.stdout:
+        if line.startswith(prefix):
+            return line[len(prefix):].strip()
+    raise RuntimeError(f"processo terminou sem imprimir {prefix!r}")
+
+def cold(probe):
+    t0 = time.perf_counter()
+    p = subprocess.Popen([sys.executable, probe], stdout=subprocess.PIPE, text=True, cwd=repo_dir, env=run_env())
+    missing = json.loads(read_until(p, "PROBE_DONE "))
+    dt = time.perf_counter() - t0
+    p.wait()
+    return dt * 1e3, missing
+
+def warm(probe):
+    p = subprocess.Popen(
+        [sys.executable, WARM_START, "--announce"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, cwd=repo_dir, env=run_env(),
+    )
+    preload_ms = float(read_until(p, "WARM_READY "))
+    # Como no launcher: o pedido chega com o interpretador já pronto
+    t0 = time.perf_counter()
+    p.stdin.write(json.dumps({"script": probe, "argv": []}) + "\n")
+    p.stdin.flush()
+    read_until(p, "PROBE_DONE ")
+    dt = time.perf_counter() - t0
+    p.wait()
+    return dt * 1e3, preload_ms
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara abertura fria e pré-aquecida dos programas.")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'programa':<10} {'frio (ms)':>10} {'quente (ms)':>12} {'ganho':>7}  ausentes")
+    preloads = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, script in TOOLS.items():
+            probe = os.path.join(tmp, f"probe_{name.lower()}.py")
+            with open(probe, "w", encoding="utf-8") as f:
+                f.write(probe_source(os.path.join(repo_dir, "Assets", script)))
+
+            cold_runs, warm_runs, missing = [], [], []
+            for _ in range(args.runs):
+                ms, missing = cold(probe)
+                cold_runs.append(ms)
+                ms, preload_ms = warm(probe)
+                warm_runs.append(ms)
+                preloads.append(preload_ms)
+            c, w = statistics.median(cold_runs), statistics.median(warm_runs)
+            print(f"{name:<10} {c:>10.0f} {w:>12.0f} {c / w:>6.1f}x  {', '.join(missing) or '-'}")
+
+    print(f"\nPré-carregamento do warm_start.py (em segundo plano): mediana {statistics.median(preloads):.0f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Tempo de inicialização do launcher (main.py), medido com `python -X importtime`.
+
+Falha (código 1) se a mediana do import de main passar de STARTUP_BUDGET_MS
+ou se algum módulo de DEFERRED (só usados ao baixar imagem / listar portas)
+voltar a ser importado na carga. Lista também os imports diretos mais caros,
+para achar o culpado de uma regressão.
+
+Com --window (precisa de tela) mede ainda o tempo até a primeira pintura da
+janela (import + ServoValidatorApp() + update()), limite WINDOW_BUDGET_MS.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_startup.py [--window]
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+STARTUP_BUDGET_MS = 500
+WINDOW_BUDGET_MS = 1500
+RUNS = 5
+TOP = 10
+DEFERRED = ("requests", "icrawler", "serial")
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WINDOW_PROBE = """
+import time
+t0 = time.perf_counter()
+import main
+app = main.ServoValidatorApp()
+app.update()
+print(f"WINDOW_MS {(time.perf_counter() - t0) * 1e3:.1f}", flush=True)
+app.destroy()
+"""
+
+def parse_importtime(stderr):
+    """[(módulo, self_us, cumulativo_us, profundidade)] das linhas do -X importtime."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+def measure_import():
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=repo_dir, capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        raise RuntimeError(f"import main falhou:\n{out.stderr[-2000:]}")
+    return parse_importtime(out.stderr)
+
+def measure_window():
+    out = subprocess.run([sys.executable, "-c", WINDOW_PROBE], cwd=repo_dir, capture_output=True, text=True)
+    for line in out.stdout.splitlines():
+        if line.startswith("WINDOW_MS "):
+            return float(line.split()[1])
+    raise RuntimeError(f"janela não abriu:\n{out.stderr[-2000:]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Orçamento de inicialização do main.py.")
+    parser.add_argument("--window", action="store_true", help="mede também a primeira pintura (precisa de tela)")
+    args = parser.parse_args()
+
+    runs = [measure_import() for _ in range(RUNS)]
+    totals = [next(cum for name, _, cum, _ in rows if name == "main") / 1e3 for rows in runs]
+    median = statistics.median(totals)
+    loaded = {name.split(".")[0] for name, *_ in runs[-1]}
+    leaked = sorted(set(DEFERRED) & loaded)
+
+    print(f"import main: mediana {median:.0f} ms (mín {min(totals):.0f}, máx {max(totals):.0f}) "
+          f"em {RUNS} execuções; limite {STARTUP_BUDGET_MS} ms")
+    direct = [(name, cum) for name, _, cum, depth in runs[-1] if depth == 1]
+    print("\nImports diretos mais caros (última execução):")
+    for name, cum in sorted(direct, key=lambda r: -r[1])[:TOP]:
+        print(f"  {cum / 1e3:8.1f} ms  {name}")
+
+    ok = True
+    if median > STARTUP_BUDGET_MS:
+        print(f"\n[FALHA] import acima do limite de {STARTUP_BUDGET_MS} ms")
+        ok = False
+    if leaked:
+        print(f"\n[FALHA] módulos que deveriam ser carregados só quando usados: {', '.join(leaked)}")
+        ok = False
+
+    if args.window:
+        window_ms = statistics.median(measure_window() for _ in range(3))
+        print(f"\nPrimeira pintura da janela: mediana {window_ms:.0f} ms; limite {WINDOW_BUDGET_MS} ms")
+        if window_ms > WINDOW_BUDGET_MS:
+            print(f"[FALHA] janela acima do limite de {WINDOW_BUDGET_MS} ms")
+            ok = False
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""Catálogos sintéticos (reamostragem do servos.json real com ruído) para benchmarks."""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from servo_catalog import ServoCatalog, load_catalog
+
+def make_synthetic_catalog(n_rows, seed=0, base=None):
+    """
+    Sorteia n_rows linhas do catálogo real e multiplica cada valor numérico
+    por um ruído log-normal (~10%), preservando os NaN e as correlações
+    entre colunas. Os registros brutos apontam para o servo de origem.
+    """
+    base = base or load_catalog()
+    rng = np.random.default_rng(seed)
+    src = rng.integers(0, len(base), size=n_rows)
+
+    def jitter(arr):
+        arr = np.asarray(arr)[src]
+        return arr * rng.lognormal(0.0, 0.1, size=arr.shape)
+
+    columns = {name: jitter(col) for name, col in base.columns.items()}
+    slots = {name: jitter(mat) for name, mat in base.slots.items()}
+    records = [base.record(i) for i in src] if n_rows <= 200_000 else _LazyRecords(base, src)
+    return ServoCatalog(records, columns, slots)
+
+class _LazyRecords:
+    def __init__(self, base, src):
+        self.base = base
+        self.src = src
+
+    def __len__(self):
+        return len(self.src)
+
+    def __getitem__(self, i):
+        return self.base.record(self.src[i])
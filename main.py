@@ -1,21 +1,27 @@
 import os
-import json  # Para trabalhar com JSON
 import sys
+import json
+import time
 import subprocess
-import requests
 import threading
-from io import BytesIO
+import queue
+import itertools
+import codecs
+from collections import OrderedDict
 
 import customtkinter as ctk
 from PIL import Image
 from tkinter import messagebox  # Usando messagebox do tkinter
 
-# Se quiser usar pyserial, lembre-se: pip install pyserial
-import serial
-import serial.tools.list_ports
+# pyserial (pip install pyserial) e icrawler (pip install icrawler) só são
+# importados quando usados: listar portas e baixar imagens de servos
 
-# Se quiser usar icrawler, lembre-se: pip install icrawler
-from icrawler.builtin import GoogleImageCrawler
+from servo_catalog import DEFAULT_JSON_PATH, FILTERS, QueryCache, default_catalog_path, load_catalog, select
+from servo_catalog.thumbnails import get_thumbnail
+from servo_catalog.manifest import MediaManifest, safe_model_name
+from servo_catalog.prefetch import MissingCache, google_image_search
+from servo_catalog.journal import compact_if_needed
+from servo_catalog.schema import as_typed, curve
 
 ###############################################################################
 #                                  CONFIG                                     #
@@ -32,6 +38,11 @@ CONTROLE_SCRIPT = os.path.join(PROGRAMS_FOLDER, "controle.py")
 CADASTRO_SCRIPT = os.path.join(PROGRAMS_FOLDER, "Add_servo.py")  # Script de cadastro
 SCRAPPER_SCRIPT = os.path.join(PROGRAMS_FOLDER, "Servo_scrapper.py")  # Script Garimpador
 
+# Interpretador com matplotlib/scipy/pandas/... já importados, à espera do próximo programa
+WARM_START_SCRIPT = os.path.join(PROGRAMS_FOLDER, "warm_start.py")
+WARM_SPARES = 1  # quantos ficam prontos (cada um ocupa a memória dos módulos pesados)
+WARM_START_DELAY_MS = 1000  # só começa depois que a janela abriu
+
 LOGO_PATH = os.path.join("Assets", "Xmobots_logo.png")
 CAT_PATH = os.path.join("Assets", "gato.png")
 
@@ -44,59 +55,116 @@ INSTRUCTIONS = (
     "5. Controle de Servos: Gerenciamento via comunicação serial\n"
     "6. Consulta Database: Procura o servo perfeito\n\n"
     "Abaixo, você verá as mensagens de DEBUG de cada script.\n"
-    "Quando o script controle.py estiver ativo, você pode enviar comandos."
+    "Cada programa abre numa aba própria e vários podem rodar ao mesmo tempo;\n"
+    "os comandos vão para o programa da aba selecionada (ex.: controle.py)."
 )
 
+# Nome da aba de cada programa no console
+PROGRAM_TITLES = {
+    MOLA_SCRIPT: "Servo/Mola",
+    PESO_SCRIPT: "Servo/Peso",
+    AVIAO_SCRIPT: "Elevon",
+    CONTROLE_SCRIPT: "Controle",
+    CADASTRO_SCRIPT: "Cadastro",
+    SCRAPPER_SCRIPT: "Garimpador",
+}
+
 # Pasta onde salvaremos as imagens baixadas
 ICRAWLER_STORAGE = os.path.join("Database", "Images")
 if not os.path.exists(ICRAWLER_STORAGE):
     os.makedirs(ICRAWLER_STORAGE)
 
-# Agora, em vez de CSV, usaremos JSON:
-JSON_PATH = os.path.join("Database", "servos.json")
+# Pasta dos datasheets (<modelo>.pdf)
+DATASHEETS_STORAGE = os.path.join("Database", "Datasheets")
+
+# Índice modelo -> imagem / datasheet; o scan roda depois que a janela aparece
+MEDIA = MediaManifest(ICRAWLER_STORAGE, DATASHEETS_STORAGE, scan=False)
+
+# Modelos cuja busca de imagem falhou (persistido em Images/.missing.json).
+# Para baixar tudo de uma vez, fora do app: python -m servo_catalog.prefetch
+MISSING_IMAGES = MissingCache(os.path.join(ICRAWLER_STORAGE, ".missing.json"))
+
+# Últimas consultas da tela de database (filtros normalizados + mtime do catálogo):
+# alternar entre combinações já vistas não refaz a consulta
+QUERY_CACHE = QueryCache()
+
+# Quantos servos parecidos mostrar no botão "Semelhantes"
+SIMILAR_K = 9
+
+# Espera após a última edição de filtro antes de consultar (filtro ao vivo)
+QUERY_DEBOUNCE_MS = 150
+
+# Console de debug: saída dos programas lida numa thread e despejada em lotes
+OUTPUT_POLL_MS = 100
+OUTPUT_BATCH_CHUNKS = 200  # pedaços por lote (cada pedaço = até 4 KB)
+CONSOLE_MAX_LINES = 5000  # só as últimas N linhas ficam no console
+SESSION_STATS_MS = 1000  # atualização de CPU/memória de cada programa (psutil, se instalado)
+
+# Cards da grade de resultados
+CARD_WIDTH = 200
+CARD_HEIGHT = 450
+GRID_BG = "#2b2b2b"
+THUMB_CACHE_SIZE = 500  # miniaturas mantidas em memória
+IMAGE_WORKERS = 4  # threads que buscam/decodificam imagens dos cards
+
+# Objetivos do modo Pareto (chaves de servo_catalog.pareto.OBJECTIVES)
+PARETO_OBJECTIVES = {
+    "torque": "Torque (maior)",
+    "speed": "Velocidade (maior)",
+    "weight": "Peso (menor)",
+    "volume": "Tamanho LxCxA (menor)",
+    "price": "Preço (menor)",
+}
+
+# Ranking ponderado (chaves de servo_catalog.ranking.RANK_OBJECTIVES): peso inicial
+RANK_WEIGHTS = {
+    "torque_margin": ("Folga de torque", 2),
+    "weight": ("Peso (menor)", 1),
+    "price": ("Preço (menor)", 1),
+    "speed": ("Velocidade (maior)", 0),
+}
+RANK_MAX_WEIGHT = 5
+RANK_SHOW_FIRST = 60  # com ranking, só os N melhores vão para a grade (até "Mostrar todos")
+
+# Histograma ao lado de cada filtro (servo_catalog.facets)
+FACET_WIDTH = 96
+FACET_HEIGHT = 28
 
 ###############################################################################
 #                           FUNÇÃO DE BUSCA DE IMAGENS                        #
 ###############################################################################
 def fetch_image_for_model(model_name):
-    safe_model_name = model_name.replace(" ", "_").replace("/", "_")
-    servo_folder = os.path.join(ICRAWLER_STORAGE, safe_model_name)
-    
+    # Primeiro o manifesto (sem tocar no disco; ele mesmo percebe imagens
+    # que apareceram depois numa pasta vazia, como prefetch ou cópia manual)
+    local_path = MEDIA.image_for(model_name)
+    if local_path:
+        if model_name in MISSING_IMAGES:
+            MISSING_IMAGES.clear(model_name)
+        return local_path
+
+    # Busca que já falhou recentemente: não tenta de novo antes do retry_after
+    if not MISSING_IMAGES.should_try(model_name):
+        return None
+
+    servo_folder = os.path.join(ICRAWLER_STORAGE, safe_model_name(model_name))
     # Se a pasta não existir, cria-a
-    if not os.path.exists(servo_folder):
+    if not MEDIA.has_image_folder(model_name):
         os.makedirs(servo_folder, exist_ok=True)
-    # Verifica se já existe alguma imagem na pasta
-    image_files = [
-        f for f in os.listdir(servo_folder)
-        if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp'))
-    ]
-    if image_files:
-        local_path = os.path.join(servo_folder, image_files[0])
-        return local_path
 
-    # Se não houver imagem, baixa uma utilizando o GoogleImageCrawler
+    # Se não houver imagem, baixa uma utilizando o GoogleImageCrawler (icrawler
+    # só é importado na 1ª busca). Falha de rede não entra no cache de ausentes.
     try:
-        google_crawler = GoogleImageCrawler(
-            parser_threads=2,
-            downloader_threads=2,
-            storage={'root_dir': servo_folder}
-        )
-        # Faz o download de apenas uma imagem
-        google_crawler.crawl(keyword=f"{model_name} servo", max_num=1)
+        local_path = google_image_search(model_name, servo_folder, threads=2)
     except Exception as e:
         print(f"[AVISO] Falha ao baixar imagem de '{model_name}': {e}")
         return None
 
-    # Após o download, procura novamente por algum arquivo de imagem na pasta
-    image_files = [
-        f for f in os.listdir(servo_folder)
-        if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp'))
-    ]
-    if image_files:
-        local_path = os.path.join(servo_folder, image_files[0])
-        return local_path
-
-    return None
+    if local_path:
+        MEDIA.record_image(model_name, local_path)
+        MISSING_IMAGES.clear(model_name)
+    else:
+        MISSING_IMAGES.mark_missing(model_name)
+    return local_path
 
 ###############################################################################
 #                           FUNÇÕES DE LAYOUT (FLOW)                          #
@@ -126,78 +194,335 @@ def flow_layout(parent, blocks, padding_x=0, padding_y=10, margin_left=10):
             line_height = bh
 
 ###############################################################################
-#                           CÓDIGO PARA PROCESSOS                             #
+#                        HISTOGRAMAS DOS FILTROS                              #
 ###############################################################################
-current_process = None
-current_after_job = None
-
-def kill_current_process():
-    global current_process
-    if current_process and current_process.poll() is None:
-        current_process.terminate()
-    current_process = None
-
-def run_program(program_path, debug_text, extra_arg=None):
-    global current_process, current_after_job
-    kill_current_process()
-    debug_text.delete("1.0", "end")
-
-    cmd = ["python", program_path]
-    if extra_arg:
-        cmd.append(f"--{extra_arg}")
+def draw_facet(canvas, facet, kind, limit):
+    """
+    Desenha o histograma de uma coluna (catalog.facets) num canvas pequeno:
+    faixas que passam no limite em verde, as outras em cinza, e no canto
+    quantos servos passam / quantos há com os demais filtros.
+    """
+    canvas.delete("all")
+    width, height = FACET_WIDTH, FACET_HEIGHT
+    edges, counts = facet["edges"], facet["counts"]
+    top = max(int(counts.max()), 1)
+    bar_w = width / len(counts)
+    for b, count in enumerate(counts):
+        if not count:
+            continue
+        if limit is None:
+            color = "#5a8f5a"
+        elif kind == "min":
+            color = "green" if edges[b + 1] > limit else "#666666"
+        else:
+            color = "green" if edges[b] <= limit else "#666666"
+        bar_h = max(1, round((height - 10) * count / top))
+        canvas.create_rectangle(b * bar_w, height - bar_h, (b + 1) * bar_w - 1, height, fill=color, width=0)
+    total = int(counts.sum()) + facet["missing"]
+    text = f"{facet['passing']}/{total}" if limit is not None else f"{total}"
+    canvas.create_text(width - 2, 1, anchor="ne", text=text, fill="white", font=("Helvetica", 8))
 
-    try:
-        current_process = subprocess.Popen(
+###############################################################################
+#                           CÓDIGO PARA PROCESSOS                             #
+###############################################################################
+class WarmPool:
+    """
+    Mantém WARM_SPARES processos warm_start.py importando os módulos pesados
+    em segundo plano. spawn() entrega um deles ao programa pedido (linha JSON
+    no stdin) e já repõe outro; sem interpretador pronto, ou sem o
+    warm_start.py, cai no "python <script>" de sempre.
+    """
+
+    def __init__(self, spares=WARM_SPARES):
+        self.spares = spares
+        self.idle = []
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _popen(cmd):
+        return subprocess.Popen(
             cmd,
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             text=True,
-            shell=False
+            shell=False,
+            # Sem buffer no filho: as linhas aparecem no console assim que impressas
+            env={**os.environ, "PYTHONUNBUFFERED": "1"}
         )
-    except Exception as e:
-        messagebox.showerror("Erro", f"Erro ao iniciar o programa:\n{e}")
-        return
 
-    def read_output():
-        global current_after_job
-        if current_process:
-            if current_process.poll() is None:
-                output = current_process.stdout.read(1024)
-                if output:
-                    debug_text.insert("end", output)
-                    debug_text.see("end")
-                current_after_job = debug_text.after(100, read_output)
-            else:
-                remaining = current_process.stdout.read()
-                if remaining:
-                    debug_text.insert("end", remaining)
-                    debug_text.see("end")
-                debug_text.insert("end", "\n[Processo finalizado]\n")
-                debug_text.see("end")
-                if current_process.stdout:
-                    current_process.stdout.close()
-
-    read_output()
-
-def send_command_to_process(entry_widget, debug_text):
-    global current_process
-    if not current_process or current_process.poll() is not None:
-        messagebox.showinfo("Info", "Nenhum processo está em execução para receber comandos.")
-        return
-
-    cmd = entry_widget.get().strip()
-    if cmd:
+    def fill(self):
+        """Repõe os interpretadores pré-aquecidos que faltam."""
+        if not os.path.exists(WARM_START_SCRIPT):
+            return
+        with self.lock:
+            self.idle = [p for p in self.idle if p.poll() is None]
+            while len(self.idle) < self.spares:
+                try:
+                    self.idle.append(self._popen(["python", WARM_START_SCRIPT]))
+                except OSError as e:
+                    print(f"[AVISO] Não foi possível iniciar o interpretador pré-aquecido: {e}")
+                    return
+
+    def spawn(self, program_path, args=()):
+        """Processo rodando `program_path` (pré-aquecido se houver um pronto)."""
+        job = json.dumps({"script": program_path, "argv": list(args)}) + "\n"
+        process = None
+        with self.lock:
+            while self.idle and process is None:
+                worker = self.idle.pop(0)
+                if worker.poll() is not None:
+                    continue
+                try:
+                    worker.stdin.write(job)
+                    worker.stdin.flush()
+                    process = worker
+                except OSError:
+                    worker.kill()
+        if process is None:
+            process = self._popen(["python", program_path, *args])
+        self.fill()
+        return process
+
+    def shutdown(self):
+        with self.lock:
+            for worker in self.idle:
+                if worker.poll() is None:
+                    worker.terminate()
+            self.idle = []
+
+WARM_POOL = WarmPool()
+
+class OutputPump:
+    """
+    Lê a saída de um processo numa thread própria e a entrega em lotes.
+
+    A thread fica bloqueada no pipe (read1 devolve o que houver, sem esperar
+    juntar 1024 bytes); a interface só chama drain(), que nunca bloqueia.
+    """
+
+    def __init__(self, stream):
+        self.queue = queue.Queue()
+        self.finished = False
+        self.thread = threading.Thread(target=self._run, args=(stream,), daemon=True)
+        self.thread.start()
+
+    def _run(self, stream):
+        # Lê os bytes por baixo do TextIOWrapper e decodifica aos poucos
+        raw = getattr(stream, "buffer", stream)
+        decoder = codecs.getincrementaldecoder(getattr(stream, "encoding", None) or "utf-8")(errors="replace")
+        carry = ""
+        try:
+            while True:
+                data = raw.read1(4096)
+                if not data:
+                    break
+                text = carry + decoder.decode(data)
+                # "\r\n" pode chegar partido entre dois pedaços
+                carry = "\r" if text.endswith("\r") else ""
+                text = text[:-1] if carry else text
+                if text:
+                    self.queue.put(text.replace("\r\n", "\n").replace("\r", "\n"))
+            tail = carry + decoder.decode(b"", final=True)
+            if tail:
+                self.queue.put(tail.replace("\r", "\n"))
+        except (OSError, ValueError):
+            pass  # pipe fechado (processo encerrado)
+        finally:
+            self.queue.put(None)
+
+    def drain(self, max_chunks=OUTPUT_BATCH_CHUNKS):
+        """(texto que chegou desde a última chamada, terminou?)."""
+        parts = []
+        for _ in range(max_chunks):
+            try:
+                chunk = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is None:
+                self.finished = True
+                break
+            parts.append(chunk)
+        return "".join(parts), self.finished
+
+def append_console(console, text, max_lines=CONSOLE_MAX_LINES):
+    """Acrescenta ao console e descarta as linhas mais antigas além de max_lines."""
+    console.insert("end", text)
+    lines = int(console.index("end-1c").split(".")[0])
+    if lines > max_lines:
+        console.delete("1.0", f"{lines - max_lines + 1}.0")
+    console.see("end")
+
+def fmt_elapsed(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+class ProcessSession:
+    """Um programa iniciado pelo launcher: processo, leitor da saída e aba do console."""
+
+    def __init__(self, name, program_path, args, process, console, status_label):
+        self.name = name
+        self.program_path = program_path
+        self.args = list(args)
+        self.process = process
+        self.console = console
+        self.status_label = status_label
+        self.pump = OutputPump(process.stdout)
+        self.started = time.monotonic()
+        self.ended = None
+        self.exit_code = None
+        self.stats = None  # psutil.Process, criado na primeira leitura
+        self.stats_text = ""
+
+    @property
+    def running(self):
+        return self.exit_code is None
+
+    def terminate(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+
+    def read_stats(self):
+        """Texto de CPU/memória do processo ("" sem psutil)."""
+        try:
+            import psutil
+        except ImportError:
+            return "CPU/RAM: instale psutil"
         try:
-            current_process.stdin.write(cmd + "\n")
-            current_process.stdin.flush()
-            debug_text.insert("end", f"> {cmd}\n")
-            debug_text.see("end")
+            if self.stats is None:
+                self.stats = psutil.Process(self.process.pid)
+            cpu = self.stats.cpu_percent(interval=None)  # desde a leitura anterior
+            rss = self.stats.memory_info().rss / 2**20
+            return f"CPU {cpu:.0f}% | RAM {rss:.0f} MB"
+        except psutil.Error:
+            return ""
+
+    def status_text(self):
+        if self.running:
+            state = f"rodando há {fmt_elapsed(time.monotonic() - self.started)}"
+            return " | ".join(t for t in (f"PID {self.process.pid}", state, self.stats_text) if t)
+        return f"PID {self.process.pid} | finalizado (código {self.exit_code}) após {fmt_elapsed(self.ended - self.started)}"
+
+class SessionManager:
+    """
+    Programas rodando ao mesmo tempo, cada um numa aba do console com a
+    própria saída (anel de CONSOLE_MAX_LINES linhas), estado, código de
+    saída e CPU/memória. Iniciar um programa não encerra os outros; os
+    comandos digitados vão para o programa da aba selecionada.
+    """
+
+    def __init__(self, tabview):
+        self.tabview = tabview
+        self.sessions = {}  # nome da aba -> ProcessSession
+        self.after_job = None
+        self.last_stats = 0.0
+
+    def start(self, title, program_path, args=()):
+        try:
+            # Mesmo efeito de "python <script> <args>", mas sem reimportar matplotlib & cia.
+            process = WARM_POOL.spawn(program_path, args)
         except Exception as e:
-            debug_text.insert("end", f"[Erro ao enviar comando: {e}]\n")
-            debug_text.see("end")
+            messagebox.showerror("Erro", f"Erro ao iniciar o programa:\n{e}")
+            return None
+
+        name, n = title, 1
+        while name in self.sessions:
+            n += 1
+            name = f"{title} ({n})"
+        tab = self.tabview.add(name)
+
+        header = ctk.CTkFrame(tab, fg_color="transparent")
+        header.pack(fill="x", padx=5, pady=(0, 2))
+        status_label = ctk.CTkLabel(header, text="", anchor="w")
+        status_label.pack(side="left", fill="x", expand=True)
+        ctk.CTkButton(
+            header, text="Fechar aba", width=90, fg_color="gray30", command=lambda: self.close(name)
+        ).pack(side="right", padx=(5, 0))
+        ctk.CTkButton(
+            header, text="Encerrar", width=90, fg_color="red", command=lambda: self.sessions[name].terminate()
+        ).pack(side="right")
+        console = ctk.CTkTextbox(tab, width=800, height=300)
+        console.pack(fill="both", expand=True)
+
+        session = ProcessSession(name, program_path, args, process, console, status_label)
+        self.sessions[name] = session
+        status_label.configure(text=session.status_text())
+        self.tabview.set(name)
+        self._schedule()
+        return session
+
+    def find_running(self, program_path, args=()):
+        for session in self.sessions.values():
+            if session.running and session.program_path == program_path and session.args == list(args):
+                return session
+        return None
 
-    entry_widget.delete(0, "end")
+    def current(self):
+        return self.sessions.get(self.tabview.get())
+
+    def _schedule(self):
+        if self.after_job is None:
+            self.after_job = self.tabview.after(OUTPUT_POLL_MS, self.poll)
+
+    def poll(self):
+        """Despeja a saída de cada programa na sua aba e atualiza o estado."""
+        self.after_job = None
+        now = time.monotonic()
+        refresh_stats = now - self.last_stats >= SESSION_STATS_MS / 1000
+        if refresh_stats:
+            self.last_stats = now
+
+        for session in list(self.sessions.values()):
+            if not session.running:
+                continue
+            text, finished = session.pump.drain()
+            if text:
+                append_console(session.console, text)
+            if finished and session.process.poll() is not None:
+                session.exit_code = session.process.returncode
+                session.ended = now
+                session.process.stdout.close()
+                append_console(session.console, f"\n[Processo finalizado (código {session.exit_code})]\n")
+                session.status_label.configure(text=session.status_text())
+            elif refresh_stats:
+                session.stats_text = session.read_stats()
+                session.status_label.configure(text=session.status_text())
+
+        if any(session.running for session in self.sessions.values()):
+            self._schedule()
+
+    def send(self, entry_widget):
+        """Manda a linha digitada para o stdin do programa da aba selecionada."""
+        session = self.current()
+        if session is None or not session.running or session.process.poll() is not None:
+            messagebox.showinfo("Info", "Nenhum processo em execução na aba selecionada para receber comandos.")
+            return
+
+        cmd = entry_widget.get().strip()
+        if cmd:
+            try:
+                session.process.stdin.write(cmd + "\n")
+                session.process.stdin.flush()
+                append_console(session.console, f"> {cmd}\n")
+            except Exception as e:
+                append_console(session.console, f"[Erro ao enviar comando: {e}]\n")
+
+        entry_widget.delete(0, "end")
+
+    def close(self, name):
+        session = self.sessions.get(name)
+        if session is None:
+            return
+        if session.running:
+            if not messagebox.askyesno("Fechar aba", f"{name} ainda está rodando. Encerrar o programa?"):
+                return
+            session.terminate()
+        del self.sessions[name]
+        self.tabview.delete(name)
+
+    def stop_all(self):
+        for session in self.sessions.values():
+            session.terminate()
 
 ###############################################################################
 #                        SERIAL / PORTAS                                      #
@@ -205,6 +530,11 @@ def send_command_to_process(entry_widget, debug_text):
 selected_com_port = None
 
 def get_serial_ports():
+    try:
+        import serial.tools.list_ports
+    except ImportError:
+        print("[AVISO] pyserial não instalado (pip install pyserial): sem lista de portas.")
+        return []
     ports = serial.tools.list_ports.comports()
     return [p.device for p in ports]
 
@@ -213,23 +543,411 @@ def on_port_selected(choice):
     selected_com_port = choice
     print("Porta selecionada:", selected_com_port)
 
-def on_controle_button(debug_text):
+def on_controle_button(sessions):
     global selected_com_port
     if not selected_com_port or "Selecione" in selected_com_port or "Nenhuma" in selected_com_port:
         messagebox.showwarning("Aviso", "Selecione uma porta COM válida antes de iniciar o controle.")
         return
-    run_program(CONTROLE_SCRIPT, debug_text, extra_arg=selected_com_port)
+    args = [f"--{selected_com_port}"]
+    # A porta serial só abre num processo por vez
+    running = sessions.find_running(CONTROLE_SCRIPT, args)
+    if running is not None:
+        messagebox.showwarning("Aviso", f"{selected_com_port} já está em uso pela aba \"{running.name}\".")
+        sessions.tabview.set(running.name)
+        return
+    sessions.start(f"Controle {selected_com_port}", CONTROLE_SCRIPT, args)
 
 ###############################################################################
-#                      FUNÇÕES AUXILIARES / FILTROS                           #
+#                      CONSULTAS EM SEGUNDO PLANO                             #
 ###############################################################################
-def safe_float(value):
-    if value is None:
-        return None
-    try:
-        return float(value)
-    except:
-        return None
+class QueryCancelled(Exception):
+    pass
+
+class QueryWorker:
+    """
+    Thread única para as consultas do catálogo. Só a consulta mais recente
+    importa: uma nova submissão descarta a pendente e marca a que está
+    rodando como obsoleta (ela para no próximo ponto de checagem). Apenas o
+    resultado final volta para a thread do Tk, via after().
+    """
+
+    def __init__(self, tk_widget):
+        self.tk_widget = tk_widget
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.pending = None
+        self.generation = 0
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, query_fn, on_done, on_error):
+        """query_fn(is_cancelled) roda na thread; on_done/on_error rodam na thread do Tk."""
+        with self.lock:
+            self.generation += 1
+            self.pending = (self.generation, query_fn, on_done, on_error)
+        self.wakeup.set()
+
+    def cancel(self):
+        """Descarta a consulta pendente e invalida a que estiver rodando."""
+        with self.lock:
+            self.generation += 1
+            self.pending = None
+
+    def _run(self):
+        while True:
+            self.wakeup.wait()
+            with self.lock:
+                job, self.pending = self.pending, None
+                self.wakeup.clear()
+            if job is None:
+                continue
+
+            generation, query_fn, on_done, on_error = job
+            is_cancelled = lambda: generation != self.generation
+            try:
+                result = query_fn(is_cancelled)
+            except QueryCancelled:
+                continue
+            except Exception as e:
+                if not is_cancelled():
+                    self.tk_widget.after(0, lambda e=e: self._deliver(generation, on_error, e))
+                continue
+            if not is_cancelled():
+                self.tk_widget.after(0, lambda: self._deliver(generation, on_done, result))
+
+    def _deliver(self, generation, callback, value):
+        # Confere de novo na thread do Tk: pode ter chegado outra consulta no meio
+        if generation == self.generation:
+            callback(value)
+
+###############################################################################
+#                        CARREGAMENTO DE IMAGENS                              #
+###############################################################################
+class ImageLoader:
+    """
+    Pool fixo de threads com fila de prioridade para as imagens dos cards.
+
+    Prioridade 0 = card na área visível, 1 = card no overscan. cancel_all()
+    (chamado a cada nova consulta) descarta tudo o que ainda está na fila,
+    então o número de threads e de tarefas pendentes não cresce com o
+    tamanho do resultado.
+    """
+
+    def __init__(self, n_workers=IMAGE_WORKERS):
+        self.queue = queue.PriorityQueue()
+        self.lock = threading.Lock()
+        self.seq = itertools.count()
+        self.generation = 0
+        self.queued = {}  # chave -> (prioridade, seq) da entrada válida na fila
+        for _ in range(n_workers):
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, key, job, priority):
+        """Enfileira job(); se a chave já estiver na fila com prioridade menor, promove."""
+        with self.lock:
+            current = self.queued.get(key)
+            if current is not None and current[0] <= priority:
+                return
+            seq = next(self.seq)
+            self.queued[key] = (priority, seq)
+            self.queue.put((priority, seq, self.generation, key, job))
+
+    def cancel_all(self):
+        with self.lock:
+            self.generation += 1
+            self.queued.clear()
+            while True:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+    def _run(self):
+        while True:
+            priority, seq, generation, key, job = self.queue.get()
+            with self.lock:
+                # Entrada cancelada ou substituída por outra de maior prioridade
+                if generation != self.generation or self.queued.get(key, (None, None))[1] != seq:
+                    continue
+                del self.queued[key]
+            try:
+                job()
+            except Exception as e:
+                print(f"[AVISO] Falha ao carregar imagem: {e}")
+
+###############################################################################
+#                     GRADE VIRTUALIZADA DE RESULTADOS                        #
+###############################################################################
+def fmt_number(value):
+    return f"{value:g}"
+
+def servo_description(row):
+    """Texto de especificações mostrado em cada card de servo."""
+    row = as_typed(row)
+    desc_lines = []
+    if row.get("Make"):
+        desc_lines.append(f"Fabricante: {row.get('Make')}")
+    if row.get("Model"):
+        desc_lines.append(f"Modelo: {row.get('Model')}")
+    if row.get("Modulation"):
+        desc_lines.append(f"Modulação: {row.get('Modulation')}")
+    if row.get("Typical Price") is not None:
+        symbol = "$" if row.get("Currency") in (None, "USD") else f"{row.get('Currency')} "
+        desc_lines.append(f"Preço: {symbol}{row.get('Typical Price'):.2f}")
+    if row.get("Weight (g)") is not None:
+        desc_lines.append(f"Peso: {fmt_number(row.get('Weight (g)'))}g")
+
+    dims = [row.get(key) for key in ("L (mm)", "C (mm)", "A (mm)")]
+    if any(d is not None for d in dims):
+        L, C, A = ("" if d is None else fmt_number(d) for d in dims)
+        desc_lines.append(f"LxCxA: {L}x{C}x{A}mm")
+
+    tensoes, torques = curve(row, "torque")
+    if any(tensao is not None for tensao in tensoes):
+        desc_lines.append("Tensão (V) x Torque (kgf.cm)")
+        for tensao, torque in zip(tensoes, torques):
+            if tensao is not None:
+                torque = "" if torque is None else fmt_number(torque)
+                desc_lines.append(f"    | @{fmt_number(tensao)}V - {torque}kgf.m |")
+
+    return "\n".join(desc_lines)
+
+def open_datasheet(model):
+    datasheet_path = MEDIA.datasheet_for(model)
+    if datasheet_path:
+        try:
+            if sys.platform.startswith('win'):
+                os.startfile(datasheet_path)
+            elif sys.platform.startswith('darwin'):
+                subprocess.call(['open', datasheet_path])
+            else:
+                subprocess.call(['xdg-open', datasheet_path])
+        except Exception as e:
+            messagebox.showerror("Erro", f"Falha ao abrir PDF:\n{e}")
+    else:
+        messagebox.showwarning("Aviso", "Datasheet não encontrado.")
+
+class ServoCard(ctk.CTkFrame):
+    """
+    Card de um servo (200x450). Os widgets são criados uma vez e reaproveitados
+    pela VirtualGrid: show() só troca textos e reinicia a imagem.
+    """
+
+    _blank = None
+
+    def __init__(self, master, app):
+        super().__init__(master, corner_radius=8, fg_color="#333333", width=CARD_WIDTH, height=CARD_HEIGHT)
+        # Impedir que o frame se expanda/contraia para caber o conteúdo
+        self.pack_propagate(False)
+        self.grid_propagate(False)
+
+        self.app = app
+        self.model = ""
+        self.catalog_idx = None
+        self.catalog = None  # catálogo de onde veio catalog_idx
+        self.token = 0  # muda a cada show(); imagens atrasadas de outro servo são ignoradas
+        self.image_pending = False
+
+        # Título (Fabricante)
+        self.lbl_title_make = ctk.CTkLabel(
+            self,
+            text="",
+            font=("Helvetica", 16, "bold"),
+            width=180,
+            wraplength=180
+        )
+        self.lbl_title_make.pack(padx=5, pady=1)
+
+        # Modelo
+        self.lbl_title_model = ctk.CTkLabel(
+            self,
+            text="",
+            font=("Helvetica", 20, "bold"),
+            width=180,
+            wraplength=180
+        )
+        self.lbl_title_model.pack(padx=5, pady=5)
+
+        # Placeholder para a imagem (quadrado fixo)
+        self.lbl_img = ctk.CTkLabel(self, text="(Baixando Imagem...)", width=80, height=80)
+        self.lbl_img.pack(padx=5, pady=5)
+
+        # Informações abaixo do placeholder
+        self.lbl_desc = ctk.CTkLabel(self, text="", font=("Helvetica", 15), justify="left", width=180, wraplength=180)
+        self.lbl_desc.pack(padx=5, pady=5)
+
+        # Botão para datasheet
+        self.btn_pdf = ctk.CTkButton(self, text="Datasheet", fg_color="green", command=lambda: open_datasheet(self.model))
+        self.btn_pdf.pack(pady=(0, 5))
+
+        # Botão para buscar servos parecidos (k vizinhos mais próximos)
+        self.btn_similar = ctk.CTkButton(
+            self,
+            text="Semelhantes",
+            fg_color="green",
+            command=lambda: self.app.show_similar(self.catalog, self.catalog_idx)
+        )
+        self.btn_similar.pack(pady=(0, 5))
+
+    def show(self, row, catalog_idx):
+        self.token += 1
+        self.model = row.get("Model") or ""
+        self.catalog_idx = catalog_idx
+        self.lbl_title_make.configure(text=row.get("Make") or "")
+        self.lbl_title_model.configure(text=self.model)
+        self.lbl_desc.configure(text=servo_description(row))
+        self.set_image(None, "(Baixando Imagem...)")
+        self.image_pending = True
+
+    def set_image(self, image, text=""):
+        # CTkLabel não remove a imagem com image=None: usa uma miniatura vazia
+        if image is None:
+            image = ServoCard.blank_image()
+        self.lbl_img.configure(image=image, text=text)
+        self.lbl_img.image = image
+
+    @staticmethod
+    def blank_image():
+        if ServoCard._blank is None:
+            blank = Image.new("RGBA", (80, 80), (0, 0, 0, 0))
+            ServoCard._blank = ctk.CTkImage(light_image=blank, dark_image=blank, size=(80, 80))
+        return ServoCard._blank
+
+class VirtualGrid(ctk.CTkFrame):
+    """
+    Grade rolável que só materializa os cards visíveis (+ overscan_rows linhas).
+
+    Os cards ficam num Canvas como janelas embutidas; ao rolar, os que saem da
+    área visível voltam para um pool e são reaproveitados nas novas posições,
+    então o número de widgets não depende do total de resultados.
+    make_card(parent) cria um card; bind_card(card, item, in_view) o preenche
+    (in_view=False para cards do overscan); on_enter_view(card) avisa quando
+    um card do overscan passa a ficar visível. Um item que volta à tela (ex.:
+    consulta repetida) pega de preferência o card do pool que já o mostrava.
+    """
+
+    def __init__(self, master, make_card, bind_card, card_width, card_height,
+                 pad_x=10, pad_y=10, overscan_rows=1, on_enter_view=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.make_card = make_card
+        self.bind_card = bind_card
+        self.on_enter_view = on_enter_view
+        self.card_width = card_width
+        self.card_height = card_height
+        self.pad_x = pad_x
+        self.pad_y = pad_y
+        self.overscan_rows = overscan_rows
+
+        self.canvas = ctk.CTkCanvas(self, bg=GRID_BG, highlightthickness=0, yscrollincrement=40)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.items = []
+        self.pool = []
+        self.active = {}    # posição -> card
+        self.in_view = range(0)  # posições dentro da área visível (sem overscan)
+        self.windows = {}   # card -> id da janela no canvas
+        self.bound = {}     # card -> último item preenchido nele
+        self.n_columns = 0
+        self.empty_text_id = self.canvas.create_text(
+            20, 20, anchor="nw", text="", fill="white", font=("Helvetica", 14)
+        )
+
+        self.canvas.bind("<Configure>", lambda event: self.refresh())
+        # (CTkFrame não permite bind_all; o canvas é um tkinter.Canvas comum)
+        self.canvas.bind_all("<MouseWheel>", self.on_mousewheel, add="+")
+        self.canvas.bind_all("<Button-4>", self.on_mousewheel, add="+")
+        self.canvas.bind_all("<Button-5>", self.on_mousewheel, add="+")
+
+    @property
+    def row_height(self):
+        return self.card_height + self.pad_y
+
+    def set_items(self, items, empty_text=""):
+        for pos in list(self.active):
+            self._release(pos)
+        self.items = list(items)
+        self.in_view = range(0)
+        self.canvas.itemconfigure(self.empty_text_id, text=empty_text if not self.items else "")
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def refresh(self):
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        n_columns = max(1, (width - self.pad_x) // (self.card_width + self.pad_x))
+        if n_columns != self.n_columns:
+            # Largura mudou: todas as posições mudam de lugar
+            for pos in list(self.active):
+                self._release(pos)
+            self.n_columns = n_columns
+
+        n_rows = -(-len(self.items) // n_columns)
+        total_height = n_rows * self.row_height + self.pad_y
+        self.canvas.configure(scrollregion=(0, 0, width, max(total_height, height)))
+
+        top = self.canvas.canvasy(0)
+        view_first = int(top // self.row_height)
+        view_last = int((top + height) // self.row_height)
+        first_row = max(0, view_first - self.overscan_rows)
+        last_row = view_last + self.overscan_rows
+        wanted = range(first_row * n_columns, min(len(self.items), (last_row + 1) * n_columns))
+        previous_view = self.in_view
+        self.in_view = range(view_first * n_columns, min(len(self.items), (view_last + 1) * n_columns))
+
+        for pos in list(self.active):
+            if pos not in wanted:
+                self._release(pos)
+        for pos in wanted:
+            if pos not in self.active:
+                self._acquire(pos)
+            elif pos in self.in_view and pos not in previous_view and self.on_enter_view:
+                self.on_enter_view(self.active[pos])
+
+    def _acquire(self, pos):
+        item = self.items[pos]
+        card = next((c for c in self.pool if self.bound.get(c) == item), None)
+        if card is not None:
+            self.pool.remove(card)
+        else:
+            card = self.pool.pop() if self.pool else self._new_card()
+        x = self.pad_x + (pos % self.n_columns) * (self.card_width + self.pad_x)
+        y = self.pad_y + (pos // self.n_columns) * self.row_height
+        window_id = self.windows[card]
+        self.canvas.coords(window_id, x, y)
+        self.canvas.itemconfigure(window_id, state="normal")
+        self.active[pos] = card
+        self.bound[card] = item
+        self.bind_card(card, item, pos in self.in_view)
+
+    def _release(self, pos):
+        card = self.active.pop(pos)
+        self.canvas.itemconfigure(self.windows[card], state="hidden")
+        self.pool.append(card)
+
+    def _new_card(self):
+        card = self.make_card(self.canvas)
+        self.windows[card] = self.canvas.create_window(0, 0, window=card, anchor="nw", state="hidden")
+        return card
+
+    def on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def on_mousewheel(self, event):
+        # Só rola se o ponteiro estiver sobre a grade (bind_all pega a janela toda)
+        widget = self.winfo_containing(event.x_root, event.y_root)
+        if widget is None or not str(widget).startswith(str(self.canvas)):
+            return
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        else:
+            steps = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(steps * 3, "units")
+        self.refresh()
 
 ###############################################################################
 #                             JANELA PRINCIPAL                                #
@@ -262,14 +980,9 @@ class ServoValidatorApp(ctk.CTk):
         )
         self.title_label.pack(side="left", padx=10, pady=20)
 
-        # Logo
-        try:
-            logo_img = Image.open(LOGO_PATH)
-            self.logo_img_ctk = ctk.CTkImage(light_image=logo_img, dark_image=logo_img, size=(200, 50))
-            self.logo_label = ctk.CTkLabel(self.top_frame, image=self.logo_img_ctk, text="")
-            self.logo_label.pack(side="right", padx=20)
-        except Exception as e:
-            print(f"Erro ao carregar logo: {e}")
+        # Logo (a imagem é decodificada depois que a janela aparece: finish_startup)
+        self.logo_label = ctk.CTkLabel(self.top_frame, text="", width=200, height=50)
+        self.logo_label.pack(side="right", padx=20)
 
         # Main frame (dividido em esquerdo/direito)
         self.main_frame = ctk.CTkFrame(self)
@@ -326,14 +1039,11 @@ class ServoValidatorApp(ctk.CTk):
         self.dropdown_frame.pack(pady=(15, 5))
         ctk.CTkLabel(self.dropdown_frame, text="Portas:").pack(side="left", padx=5)
 
-        ports = get_serial_ports()
-        if not ports:
-            ports = ["Nenhuma Porta Encontrada"]
-
+        # A enumeração das portas roda em segundo plano (finish_startup)
         self.port_var = ctk.StringVar(value="Selecione a Porta")
         self.combo_port = ctk.CTkOptionMenu(
             self.dropdown_frame,
-            values=ports,
+            values=["Procurando portas..."],
             command=on_port_selected,
             variable=self.port_var,
             fg_color="green",
@@ -344,7 +1054,7 @@ class ServoValidatorApp(ctk.CTk):
             self.left_frame, 
             text="Controle de Servo",
             fg_color="green",
-            command=lambda: on_controle_button(self.debug_text)
+            command=lambda: on_controle_button(self.sessions)
         )
         self.btn_controle.pack(pady=10)
 
@@ -380,8 +1090,10 @@ class ServoValidatorApp(ctk.CTk):
         )
         self.instructions_label.pack(padx=20, pady=10, fill="x")
 
-        self.debug_text = ctk.CTkTextbox(self.debug_frame, width=800, height=300)
-        self.debug_text.pack(padx=10, pady=5, fill="both", expand=True)
+        # Uma aba por programa iniciado (SessionManager)
+        self.sessions_tabview = ctk.CTkTabview(self.debug_frame, width=800, height=300)
+        self.sessions_tabview.pack(padx=10, pady=5, fill="both", expand=True)
+        self.sessions = SessionManager(self.sessions_tabview)
 
         self.command_frame = ctk.CTkFrame(self.debug_frame)
         self.command_frame.pack(fill="x", pady=(0, 10))
@@ -394,7 +1106,7 @@ class ServoValidatorApp(ctk.CTk):
             self.command_frame, 
             text="Enviar",
             fg_color="green",
-            command=lambda: send_command_to_process(self.entry_cmd, self.debug_text)
+            command=lambda: self.sessions.send(self.entry_cmd)
         )
         self.btn_enviar.pack(side="left", padx=5)
 
@@ -402,21 +1114,49 @@ class ServoValidatorApp(ctk.CTk):
         self.db_frame = ctk.CTkFrame(self.right_frame)
         self.create_db_area()
 
-        # Gato no canto
+        # Portas, logo/gato e scan de imagens só depois da primeira pintura:
+        # a janela é desenhada agora e o resto entra na fila de eventos
+        self.update_idletasks()
+        self.after(0, self.finish_startup)
+
+    def finish_startup(self):
+        """Trabalho de inicialização que não precisa atrasar a janela (em threads)."""
+        threading.Thread(target=self.load_startup_assets, daemon=True).start()
+        threading.Thread(target=MEDIA.rescan, daemon=True).start()
+
+    def load_startup_assets(self):
+        ports = get_serial_ports() or ["Nenhuma Porta Encontrada"]
+        self.after(0, lambda: self.combo_port.configure(values=ports))
+
+        # Decodifica na thread; os widgets são atualizados na thread do Tk
+        try:
+            logo_img = Image.open(LOGO_PATH)
+            logo_img.load()
+            self.after(0, lambda: self.show_logo(logo_img))
+        except Exception as e:
+            print(f"Erro ao carregar logo: {e}")
         try:
             cat_img_raw = Image.open(CAT_PATH).resize((50, 50))
-            self.cat_img_ctk = ctk.CTkImage(light_image=cat_img_raw, dark_image=cat_img_raw, size=(50, 50))
-            self.cat_label = ctk.CTkLabel(self, image=self.cat_img_ctk, text="")
-            self.cat_label.place(relx=1.0, rely=1.0, x=-5, y=-5, anchor="se")
+            self.after(0, lambda: self.show_cat(cat_img_raw))
         except Exception as e:
             print(f"Erro ao carregar gato.png: {e}")
 
+    def show_logo(self, logo_img):
+        self.logo_img_ctk = ctk.CTkImage(light_image=logo_img, dark_image=logo_img, size=(200, 50))
+        self.logo_label.configure(image=self.logo_img_ctk)
+
+    def show_cat(self, cat_img_raw):
+        # Gato no canto
+        self.cat_img_ctk = ctk.CTkImage(light_image=cat_img_raw, dark_image=cat_img_raw, size=(50, 50))
+        self.cat_label = ctk.CTkLabel(self, image=self.cat_img_ctk, text="")
+        self.cat_label.place(relx=1.0, rely=1.0, x=-5, y=-5, anchor="se")
+
     def on_sair(self):
-        kill_current_process()
+        self.sessions.stop_all()
         self.quit()
 
     def run_script(self, script_path):
-        run_program(script_path, self.debug_text)
+        self.sessions.start(PROGRAM_TITLES.get(script_path, os.path.basename(script_path)), script_path)
 
     def toggle_db_view(self):
         if self.debug_frame.winfo_ismapped():
@@ -450,29 +1190,51 @@ class ServoValidatorApp(ctk.CTk):
         self.filter_panel = ctk.CTkFrame(self.db_container, fg_color="#222222")
         self.filter_panel.grid(row=0, column=0, sticky="nsw", padx=5, pady=5)
 
+        # Busca textual (Fabricante/Modelo/Link), atualizada a cada tecla
+        self.search_frame = ctk.CTkFrame(self.filter_panel)
+        self.search_frame.pack(fill="x", padx=5, pady=(5, 3))
+        ctk.CTkLabel(self.search_frame, text="Buscar:").pack(side="left", padx=5, pady=4)
+        self.ent_search = ctk.CTkEntry(
+            self.search_frame, width=220, placeholder_text="Fabricante ou modelo (ex.: HS-645MG)"
+        )
+        self.ent_search.pack(side="left", fill="x", expand=True, padx=5, pady=4)
+        self.ent_search.bind("<KeyRelease>", self.schedule_query)
+
         # Frame com fluxo (filtros)
         self.filters_flow_frame = ctk.CTkFrame(self.filter_panel, height=500)
         self.filters_flow_frame.pack(fill="both", padx=5, pady=3)
         self.filters_flow_frame.bind("<Configure>", self.on_filters_flow_configure)
 
+        # Histograma de cada filtro: argumento de FILTERS -> canvas
+        self.facet_canvases = {}
+
         # Função auxiliar para criar blocos de filtro
-        def add_filter_block(label_text):
+        def add_filter_block(label_text, filter_arg=None):
             block_frame = ctk.CTkFrame(self.filters_flow_frame)
             lbl = ctk.CTkLabel(block_frame, text=label_text)
             ent = ctk.CTkEntry(block_frame, width=70)
             lbl.pack(side="left", padx=5, pady=4)
             ent.pack(side="left", padx=5, pady=4)
+            ent.bind("<KeyRelease>", self.schedule_query)
+            if filter_arg is not None:
+                canvas = ctk.CTkCanvas(
+                    block_frame, width=FACET_WIDTH, height=FACET_HEIGHT, bg=GRID_BG, highlightthickness=0
+                )
+                canvas.pack(side="left", padx=(0, 5), pady=4)
+                self.facet_canvases[filter_arg] = canvas
             block_frame.update_idletasks()
             return block_frame, ent
 
-        self.block_torque_min, self.ent_torque_min = add_filter_block("Torque mín (kgf.cm):")
-        self.block_torque_max, self.ent_torque_max = add_filter_block("Torque máx (kgf.cm):")
-        self.block_weight_max, self.ent_weight_max = add_filter_block("Peso máx (g):")
-        self.block_length_max, self.ent_length_max = add_filter_block("Compr. máx (mm):")
-        self.block_width_max, self.ent_width_max = add_filter_block("Larg. máx (mm):")
-        self.block_height_max, self.ent_height_max = add_filter_block("Altura máx (mm):")
-        self.block_speed_min, self.ent_speed_min = add_filter_block("Vel. ang mín (°/s):")
-        self.block_price_max, self.ent_price_max = add_filter_block("Preço máx ($):")
+        self.block_torque_min, self.ent_torque_min = add_filter_block("Torque mín (kgf.cm):", "torque_min")
+        self.block_torque_max, self.ent_torque_max = add_filter_block("Torque máx (kgf.cm):", "torque_max")
+        self.block_weight_max, self.ent_weight_max = add_filter_block("Peso máx (g):", "weight_max")
+        self.block_length_max, self.ent_length_max = add_filter_block("Compr. máx (mm):", "length_max")
+        self.block_width_max, self.ent_width_max = add_filter_block("Larg. máx (mm):", "width_max")
+        self.block_height_max, self.ent_height_max = add_filter_block("Altura máx (mm):", "height_max")
+        self.block_speed_min, self.ent_speed_min = add_filter_block("Vel. ang mín (°/s):", "speed_min")
+        self.block_price_max, self.ent_price_max = add_filter_block("Preço máx ($):", "price_max")
+        # Torque/velocidade dos filtros passam a ser avaliados nessa tensão
+        self.block_bus_voltage, self.ent_bus_voltage = add_filter_block("Tensão barram. (V):")
 
         self.filter_blocks = [
             self.block_torque_min,
@@ -482,9 +1244,60 @@ class ServoValidatorApp(ctk.CTk):
             self.block_width_max,
             self.block_height_max,
             self.block_speed_min,
-            self.block_price_max
+            self.block_price_max,
+            self.block_bus_voltage
         ]
 
+        # Modo Pareto: mostra só os servos não dominados nos objetivos marcados
+        self.pareto_frame = ctk.CTkFrame(self.filter_panel)
+        self.pareto_frame.pack(fill="x", padx=5, pady=(8, 3))
+
+        self.pareto_var = ctk.BooleanVar(value=False)
+        self.switch_pareto = ctk.CTkSwitch(
+            self.pareto_frame,
+            text="Modo Pareto (só não dominados)",
+            variable=self.pareto_var,
+            progress_color="green",
+            command=self.schedule_query
+        )
+        self.switch_pareto.pack(anchor="w", padx=5, pady=4)
+
+        self.pareto_objective_vars = {}
+        for name, label_text in PARETO_OBJECTIVES.items():
+            var = ctk.BooleanVar(value=name in ("torque", "weight"))
+            ctk.CTkCheckBox(
+                self.pareto_frame, text=label_text, variable=var, fg_color="green",
+                command=self.schedule_query
+            ).pack(anchor="w", padx=20, pady=2)
+            self.pareto_objective_vars[name] = var
+
+        # Ranking: ordena pela pontuação ponderada (torque exigido = Torque mín)
+        self.rank_frame = ctk.CTkFrame(self.filter_panel)
+        self.rank_frame.pack(fill="x", padx=5, pady=3)
+
+        self.rank_var = ctk.BooleanVar(value=False)
+        ctk.CTkSwitch(
+            self.rank_frame,
+            text="Ranking por pesos",
+            variable=self.rank_var,
+            progress_color="green",
+            command=self.schedule_query
+        ).pack(anchor="w", padx=5, pady=4)
+
+        self.rank_weight_vars = {}
+        for name, (label_text, default) in RANK_WEIGHTS.items():
+            row = ctk.CTkFrame(self.rank_frame, fg_color="transparent")
+            row.pack(fill="x", padx=20, pady=1)
+            var = ctk.IntVar(value=default)
+            ctk.CTkLabel(row, text=label_text, width=120, anchor="w").pack(side="left")
+            ctk.CTkLabel(row, textvariable=var, width=20).pack(side="right")
+            ctk.CTkSlider(
+                row, from_=0, to=RANK_MAX_WEIGHT, number_of_steps=RANK_MAX_WEIGHT, variable=var,
+                width=120, command=lambda value: self.schedule_query()
+            ).pack(side="right", padx=4)
+            self.rank_weight_vars[name] = var
+        self.rank_show_all = False
+
         self.btn_aplicar = ctk.CTkButton(
             self.filter_panel, 
             text="Aplicar Filtros", 
@@ -497,22 +1310,83 @@ class ServoValidatorApp(ctk.CTk):
         self.results_panel = ctk.CTkFrame(self.db_container)
         self.results_panel.grid(row=0, column=1, sticky="nsew", padx=1, pady=5)
 
-        self.servos_scrollable_frame = ctk.CTkScrollableFrame(self.results_panel)
-        self.servos_scrollable_frame.pack(fill="both", expand=True, padx=2, pady=2)
+        self.results_header = ctk.CTkFrame(self.results_panel, fg_color="transparent")
+        self.results_header.pack(fill="x", padx=8, pady=(2, 0))
+        self.results_info_label = ctk.CTkLabel(self.results_header, text="", anchor="w")
+        self.results_info_label.pack(side="left", fill="x", expand=True)
+        # Só aparece quando o ranking cortou a lista nos RANK_SHOW_FIRST melhores
+        self.btn_show_all = ctk.CTkButton(
+            self.results_header, text="Mostrar todos", width=110, command=self.show_all_ranked
+        )
 
-        self.servo_blocks = []
-        self.image_load_data = []
+        # Só os cards visíveis existem como widgets (reciclados ao rolar)
+        self.results_grid = VirtualGrid(
+            self.results_panel,
+            make_card=lambda parent: ServoCard(parent, self),
+            bind_card=self.bind_servo_card,
+            card_width=CARD_WIDTH,
+            card_height=CARD_HEIGHT,
+            on_enter_view=self.promote_card_image,
+        )
+        self.results_grid.pack(fill="both", expand=True, padx=2, pady=2)
+
+        # Filtro ao vivo: debounce + consulta numa thread própria
+        self.query_worker = QueryWorker(self)
+        self.query_after_job = None
+        self.last_query_params = None
+
+        self.image_loader = ImageLoader()
+        self.results_catalog = None
+        self.thumb_cache = OrderedDict()  # modelo -> CTkImage já reduzida (LRU)
 
     def on_filters_flow_configure(self, event):
         flow_layout(self.filters_flow_frame, self.filter_blocks, padding_x=10, padding_y=5)
 
+    def schedule_query(self, event=None):
+        """Filtro ao vivo: reinicia o debounce a cada edição."""
+        self.rank_show_all = False
+        # Os histogramas não esperam o debounce: são só contagens sobre as colunas
+        self.update_facets()
+        if self.query_after_job is not None:
+            self.after_cancel(self.query_after_job)
+        self.query_after_job = self.after(QUERY_DEBOUNCE_MS, self.start_query)
+
+    def update_facets(self):
+        """Redesenha os histogramas dos filtros para os valores digitados agora."""
+        if self.results_catalog is None:
+            return  # catálogo ainda não carregado (a 1ª consulta chama de novo)
+        filters = dict(self.read_query_params()["filters"])
+        bus_voltage = filters.pop("bus_voltage")
+        facets = self.results_catalog.facets(bus_voltage, **filters)
+        for arg, canvas in self.facet_canvases.items():
+            name, kind = FILTERS[arg]
+            draw_facet(canvas, facets[name], kind, filters[arg])
+
     def aplicar_filtros(self):
-        # Remove blocos antigos
-        for sb in self.servo_blocks:
-            sb.destroy()
-        self.servo_blocks.clear()
-        self.image_load_data = []  # Reinicia a lista de imagens
+        self.start_query(explicit=True)
+
+    def show_all_ranked(self):
+        self.rank_show_all = True
+        self.start_query(explicit=True)
+
+    def start_query(self, explicit=False):
+        if self.query_after_job is not None:
+            self.after_cancel(self.query_after_job)
+        self.query_after_job = None
+
+        # Os widgets só podem ser lidos na thread do Tk
+        params = self.read_query_params()
+        if params == self.last_query_params and not explicit:
+            return  # ex.: tecla de seta, nada mudou
+        self.last_query_params = params
+
+        self.query_worker.submit(
+            lambda is_cancelled: self.run_query(params, is_cancelled),
+            on_done=lambda result: self.show_results(*result),
+            on_error=lambda e: self.on_query_error(e, explicit),
+        )
 
+    def read_query_params(self):
         def readfloat(entry):
             txt = entry.get().strip()
             if not txt:
@@ -522,212 +1396,202 @@ class ServoValidatorApp(ctk.CTk):
             except:
                 return None
 
-        torque_min = readfloat(self.ent_torque_min)
-        torque_max = readfloat(self.ent_torque_max)
-        weight_max = readfloat(self.ent_weight_max)
-        length_max = readfloat(self.ent_length_max)
-        width_max = readfloat(self.ent_width_max)
-        height_max = readfloat(self.ent_height_max)
-        speed_min = readfloat(self.ent_speed_min)
-        price_max = readfloat(self.ent_price_max)
-
-        if not os.path.exists(JSON_PATH):
-            messagebox.showerror("Erro", "Arquivo de database (JSON) não encontrado.")
-            return
-
-        matched_results = []
-        try:
-            with open(JSON_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if "servos" not in data:
-                    data["servos"] = []
-                for row in data["servos"]:
-                    weight = safe_float(row.get("Weight (g)"))
-                    L = safe_float(row.get("L (mm)"))
-                    C = safe_float(row.get("C (mm)"))
-                    A = safe_float(row.get("A (mm)"))
-
-                    torque_cols = [
-                        safe_float(row.get("Torque1 (kgf.cm)")),
-                        safe_float(row.get("Torque2 (kgf.cm)")),
-                        safe_float(row.get("Torque3 (kgf.cm)")),
-                        safe_float(row.get("Torque4 (kgf.cm)")),
-                        safe_float(row.get("Torque5 (kgf.cm)")),
-                    ]
-                    max_torque = max([t for t in torque_cols if t is not None] or [0])
-
-                    speed_cols = [
-                        safe_float(row.get("Speed1 (°/s)")),
-                        safe_float(row.get("Speed2 (°/s)")),
-                        safe_float(row.get("Speed3 (°/s)")),
-                        safe_float(row.get("Speed4 (°/s)")),
-                        safe_float(row.get("Speed5 (°/s)")),
-                    ]
-                    max_speed = max([s for s in speed_cols if s is not None] or [0])
-
-                    price_str = row.get("Typical Price", "").replace("$", "")
-                    price_val = safe_float(price_str)
-
-                    if torque_min is not None and max_torque < torque_min:
-                        continue
-                    if torque_max is not None and max_torque > torque_max:
-                        continue
-                    if weight_max is not None and weight is not None and weight > weight_max:
-                        continue
-                    if length_max is not None and L is not None and L > length_max:
-                        continue
-                    if width_max is not None and C is not None and C > width_max:
-                        continue
-                    if height_max is not None and A is not None and A > height_max:
-                        continue
-                    if speed_min is not None and max_speed < speed_min:
-                        continue
-                    if price_max is not None and price_val is not None and price_val > price_max:
-                        continue
-
-                    matched_results.append(row)
-        except Exception as e:
-            messagebox.showerror("Erro JSON", f"Falha ao ler JSON: {e}")
-            return
+        filters = {
+            "torque_min": readfloat(self.ent_torque_min),
+            "torque_max": readfloat(self.ent_torque_max),
+            "weight_max": readfloat(self.ent_weight_max),
+            "length_max": readfloat(self.ent_length_max),
+            "width_max": readfloat(self.ent_width_max),
+            "height_max": readfloat(self.ent_height_max),
+            "speed_min": readfloat(self.ent_speed_min),
+            "price_max": readfloat(self.ent_price_max),
+            "bus_voltage": readfloat(self.ent_bus_voltage),
+        }
+        pareto = None
+        if self.pareto_var.get():
+            pareto = tuple(name for name, var in self.pareto_objective_vars.items() if var.get())
+        ranking = None
+        if self.rank_var.get():
+            ranking = {name: var.get() for name, var in self.rank_weight_vars.items()}
+        return {
+            "filters": filters,
+            "search": self.ent_search.get().strip(),
+            "pareto": pareto,
+            "ranking": ranking,
+            "show_all": self.rank_show_all,
+        }
+
+    @staticmethod
+    def run_query(params, is_cancelled):
+        """Roda na QueryWorker; não toca em widgets."""
+        def checkpoint():
+            if is_cancelled():
+                raise QueryCancelled()
+
+        path = default_catalog_path()
+        if not os.path.exists(path):
+            raise FileNotFoundError("Arquivo de database (JSON) não encontrado.")
+
+        # O catálogo só é relido quando o arquivo muda; com o SQLite os filtros
+        # viram consultas por faixa nos índices, com o JSON uma máscara NumPy
+        catalog = load_catalog(path)
+        checkpoint()
+
+        filters = dict(params["filters"])
+        bus_voltage = filters.pop("bus_voltage")
+        # Filtros -> busca (mais relevantes primeiro) -> Pareto -> ranking, pela API do servo_catalog
+        ranking = params["ranking"]
+        weights = {name: w for name, w in ranking.items() if w} if ranking else None
+        selection = select(
+            catalog,
+            bus_voltage=bus_voltage,
+            search=params["search"],
+            pareto=params["pareto"],
+            weights=weights or None,
+            # Top-k por argpartition: a grade recebe só os melhores
+            top=None if params["show_all"] or not weights else RANK_SHOW_FIRST,
+            checkpoint=checkpoint,
+            cache=QUERY_CACHE,
+            **filters,
+        )
+        matched_idx = selection.indices
+        # Quantos passaram por todas as etapas (antes do corte do ranking)
+        found = list(selection.counts.values())[-1]
+        info_text = f"{found} servo(s) encontrado(s)."
+        truncated = len(matched_idx) < found
+
+        if params["pareto"] is not None:
+            if params["pareto"]:
+                total = selection.counts.get("search", selection.counts["filter"])
+                info_text = f"Fronteira de Pareto: {found} de {total} servo(s) filtrado(s)."
+            else:
+                info_text += " Modo Pareto: marque ao menos um objetivo."
 
-        if not matched_results:
-            msg = ctk.CTkLabel(self.servos_scrollable_frame, text="Nenhum resultado encontrado.", font=("Helvetica", 14))
-            msg.pack(padx=10, pady=10)
-            self.servo_blocks.append(msg)
+        if ranking is not None:
+            if weights:
+                shown = f"os {len(matched_idx)} melhores" if truncated else "todos"
+                info_text += f" Ranking: {shown}, da maior para a menor pontuação."
+            else:
+                info_text += " Ranking: dê peso a ao menos um objetivo."
+
+        if bus_voltage is not None:
+            info_text += f" Torque e velocidade avaliados a {bus_voltage:g} V."
+        return catalog, matched_idx, info_text, truncated
+
+    def on_query_error(self, error, explicit):
+        self.last_query_params = None  # permite repetir a mesma consulta
+        if explicit:
+            messagebox.showerror("Erro", f"Falha na consulta:\n{error}")
+        self.results_info_label.configure(text=f"Erro na consulta: {error}")
+
+    def show_similar(self, catalog, catalog_idx):
+        """
+        Mostra o servo escolhido seguido dos SIMILAR_K mais parecidos (k-d tree).
+        Usa o catálogo de onde o card veio: catalog_idx só vale nele (o arquivo
+        pode ter mudado depois da consulta).
+        """
+        if catalog is None:
             return
-
-        # Cria os blocos
-        for idx, row in enumerate(matched_results):
-            block = self.create_servo_block(row, parent=self.servos_scrollable_frame)
-            row_idx = idx // 5
-            col_idx = idx % 5
-            block.grid(row=row_idx, column=col_idx, padx=10, pady=10, sticky="n")
-            self.servo_blocks.append(block)
-
-        # Após criar todos os blocos, inicia o carregamento das imagens
-        self.load_all_images()
-
-    def create_servo_block(self, row, parent):
-        # Cria o frame com largura/altura fixas
-        block_frame = ctk.CTkFrame(parent, corner_radius=8, fg_color="#333333", width=200, height=450)
-        # Impedir que o frame se expanda/contraia para caber o conteúdo
-        block_frame.pack_propagate(False)
-        block_frame.grid_propagate(False)
-
-        # Título (Fabricante)
-        make = row.get("Make", "")
-        lbl_title_make = ctk.CTkLabel(
-            block_frame, 
-            text=make, 
-            font=("Helvetica", 16, "bold"), 
-            width=180,
-            wraplength=180
+        # Uma consulta de filtro em andamento não deve sobrescrever este resultado
+        self.query_worker.cancel()
+        self.last_query_params = None
+
+        similar_idx, _ = catalog.similar(catalog_idx, k=SIMILAR_K)
+        model = catalog.record(catalog_idx).get("Model") or ""
+        self.show_results(
+            catalog,
+            [catalog_idx] + list(similar_idx),
+            f"Servos semelhantes a {model} (peso, dimensões, torque e velocidade)."
         )
-        lbl_title_make.pack(padx=5, pady=1)
 
-        # Modelo
-        model = row.get("Model", "")
-        lbl_title_model = ctk.CTkLabel(
-            block_frame, 
-            text=model, 
-            font=("Helvetica", 20, "bold"), 
-            width=180,
-            wraplength=180
+    def show_results(self, catalog, indices, info_text="", truncated=False):
+        # Imagens pendentes da consulta anterior não interessam mais
+        self.image_loader.cancel_all()
+        self.results_catalog = catalog
+        self.update_facets()
+        self.results_info_label.configure(text=info_text)
+        if truncated:
+            self.btn_show_all.pack(side="right")
+        else:
+            self.btn_show_all.pack_forget()
+        self.results_grid.set_items(indices, empty_text="Nenhum resultado encontrado.")
+
+    def bind_servo_card(self, card, catalog_idx, in_view):
+        """Chamado pela VirtualGrid quando um card (novo ou reciclado) entra na tela."""
+        if card.catalog is self.results_catalog and card.catalog_idx == catalog_idx:
+            # Mesmo servo do mesmo catálogo (ex.: consulta repetida): textos já estão lá
+            if card.image_pending:
+                self.queue_card_image(card, priority=0 if in_view else 1)
+            return
+        card.show(self.results_catalog.record(catalog_idx), catalog_idx)
+        card.catalog = self.results_catalog
+        cached = self.thumb_cache.get(card.model)
+        if cached is not None:
+            self.thumb_cache.move_to_end(card.model)
+            card.set_image(cached)
+            card.image_pending = False
+            return
+        self.queue_card_image(card, priority=0 if in_view else 1)
+
+    def promote_card_image(self, card):
+        """Card do overscan ficou visível: a imagem dele passa na frente."""
+        if card.image_pending:
+            self.queue_card_image(card, priority=0)
+
+    def queue_card_image(self, card, priority):
+        model, token = card.model, card.token
+        self.image_loader.submit(
+            (card, token),
+            lambda: self.load_image_for_card(card, model, token),
+            priority,
         )
-        lbl_title_model.pack(padx=5, pady=5)
-
-        # Placeholder para a imagem (quadrado fixo)
-        lbl_img = ctk.CTkLabel(block_frame, text="(Baixando Imagem...)", width=80, height=80)
-        lbl_img.pack(padx=5, pady=5)
 
-        # Informações abaixo do placeholder
-        desc_lines = []
-        if row.get("Make"):
-            desc_lines.append(f"Fabricante: {row.get('Make')}")
-        if row.get("Model"):
-            desc_lines.append(f"Modelo: {row.get('Model')}")
-        if row.get("Modulation"):
-            desc_lines.append(f"Modulação: {row.get('Modulation')}")
-        if row.get("Typical Price"):
-            desc_lines.append(f"Preço: {row.get('Typical Price')}")
-        if row.get("Weight (g)"):
-            desc_lines.append(f"Peso: {row.get('Weight (g)')}g")
-
-        L = row.get("L (mm)") or ""
-        C = row.get("C (mm)") or ""
-        A = row.get("A (mm)") or ""
-        if L or C or A:
-            desc_lines.append(f"LxCxA: {L}x{C}x{A}mm")
-
-        Tensao1 = row.get("TensãoTorque1")
-        Tensao2 = row.get("TensãoTorque2")
-        Tensao3 = row.get("TensãoTorque3")
-        Tensao4 = row.get("TensãoTorque4")
-        Tensao5 = row.get("TensãoTorque5")
-
-        if Tensao1 or Tensao2 or Tensao3 or Tensao4 or Tensao5:
-            desc_lines.append(f"Tensão (V) x Torque (kgf.cm)")
-            if Tensao1:
-                desc_lines.append(f"    | @{Tensao1}V - {row.get('Torque1 (kgf.cm)')}kgf.m |")
-            if Tensao2:
-                desc_lines.append(f"    | @{Tensao2}V - {row.get('Torque2 (kgf.cm)')}kgf.m |")
-            if Tensao3:
-                desc_lines.append(f"    | @{Tensao3}V - {row.get('Torque3 (kgf.cm)')}kgf.m |")
-            if Tensao4:
-                desc_lines.append(f"    | @{Tensao4}V - {row.get('Torque4 (kgf.cm)')}kgf.m |")
-            if Tensao5:
-                desc_lines.append(f"    | @{Tensao5}V - {row.get('Torque5 (kgf.cm)')}kgf.m |")
-
-        desc_text = "\n".join(desc_lines)
-        lbl_desc = ctk.CTkLabel(block_frame, text=desc_text, font=("Helvetica", 15), justify="left", width=180, wraplength=180)
-        lbl_desc.pack(padx=5, pady=5)
-
-        # Botão para datasheet
-        def open_datasheet():
-            datasheet_path = os.path.join("Database", "Datasheets", f"{model}.pdf")
-            if os.path.exists(datasheet_path):
-                try:
-                    if sys.platform.startswith('win'):
-                        os.startfile(datasheet_path)
-                    elif sys.platform.startswith('darwin'):
-                        subprocess.call(['open', datasheet_path])
-                    else:
-                        subprocess.call(['xdg-open', datasheet_path])
-                except Exception as e:
-                    messagebox.showerror("Erro", f"Falha ao abrir PDF:\n{e}")
-            else:
-                messagebox.showwarning("Aviso", "Datasheet não encontrado.")
-
-        btn_pdf = ctk.CTkButton(block_frame, text="Datasheet", fg_color="green", command=open_datasheet)
-        btn_pdf.pack(pady=(0, 5))
-
-        # Armazena os dados para carregamento posterior da imagem:
-        self.image_load_data.append((model, lbl_img))
-
-        return block_frame
-
-    def load_all_images(self):
-        """Inicia uma thread para cada imagem, carregando os arquivos após a criação de todos os blocos."""
-        for model, lbl_img in self.image_load_data:
-            threading.Thread(target=self.load_image_for_label, args=(model, lbl_img), daemon=True).start()
-
-    def load_image_for_label(self, model, lbl_img):
+    def load_image_for_card(self, card, model, token):
+        if card.token != token:
+            return  # card reciclado antes de a tarefa sair da fila
         image_path = fetch_image_for_model(model)
-        if image_path and os.path.exists(image_path):
+        servo_imgtk = None
+        if image_path:
             try:
-                img_raw = Image.open(image_path)
+                # Abre a miniatura 80x80 do cache em disco (gerada na primeira vez)
+                img_raw = Image.open(get_thumbnail(image_path))
                 img_raw.thumbnail((80, 80))
                 servo_imgtk = ctk.CTkImage(light_image=img_raw, dark_image=img_raw, size=(80, 80))
-                lbl_img.after(0, lambda: lbl_img.configure(image=servo_imgtk, text=""))
-                lbl_img.image = servo_imgtk
-            except Exception as e:
-                lbl_img.after(0, lambda: lbl_img.configure(text="(Erro na imagem)"))
+                text = ""
+            except Exception:
+                text = "(Erro na imagem)"
         else:
-            lbl_img.after(0, lambda: lbl_img.configure(text="Num achei imagem :("))
+            text = "Num achei imagem :("
+        self.after(0, lambda: self.apply_card_image(card, model, token, servo_imgtk, text))
+
+    def apply_card_image(self, card, model, token, servo_imgtk, text):
+        if servo_imgtk is not None:
+            self.thumb_cache[model] = servo_imgtk
+            self.thumb_cache.move_to_end(model)
+            while len(self.thumb_cache) > THUMB_CACHE_SIZE:
+                self.thumb_cache.popitem(last=False)
+        # O card pode ter sido reciclado para outro servo enquanto a imagem carregava
+        if card.token == token:
+            card.set_image(servo_imgtk, text)
+            card.image_pending = False
+
+def compact_journal():
+    """Incorpora no servos.json os cadastros acumulados no diário (em segundo plano)."""
+    try:
+        added = compact_if_needed(DEFAULT_JSON_PATH)
+        if added:
+            print(f"[INFO] {added} cadastro(s) do diário incorporado(s) em {DEFAULT_JSON_PATH}.")
+    except Exception as e:
+        print(f"[AVISO] Falha ao compactar o diário de cadastros: {e}")
 
 def main():
+    threading.Thread(target=compact_journal, daemon=True).start()
     app = ServoValidatorApp()
-    app.mainloop()
+    app.after(WARM_START_DELAY_MS, WARM_POOL.fill)
+    try:
+        app.mainloop()
+    finally:
+        WARM_POOL.shutdown()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,17 @@
+"""
+Catálogo de servos (Database/servos.json) em colunas NumPy, com consultas vetorizadas.
+
+Não depende de Tk/serial/icrawler: select() e `python -m servo_catalog query`
+servem para scripts, simuladores e builds sem abrir a interface.
+"""
+
+from .catalog import (
+    DEFAULT_DB_PATH,
+    DEFAULT_JSON_PATH,
+    COLUMNS,
+    FILTERS,
+    ServoCatalog,
+    default_catalog_path,
+    load_catalog,
+)
+from .query import QueryCache, Selection, select
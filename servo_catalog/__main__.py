@@ -0,0 +1,41 @@
+"""
+Linha de comando do catálogo (sem interface gráfica):
+
+    python -m servo_catalog query --torque-min 10 --voltage 7.4 --sort torque --desc --top 10
+    python -m servo_catalog <comando> --help
+
+Cada comando só importa o módulo dele.
+"""
+import sys
+import importlib
+
+# comando -> (módulo, descrição)
+COMMANDS = {
+    "query": ("servo_catalog.query", "filtra/ordena o catálogo e exporta CSV/JSON"),
+    "migrate": ("servo_catalog.schema", "converte o servos.json para o esquema atual"),
+    "compact": ("servo_catalog.journal", "incorpora o diário de cadastros no servos.json"),
+    "merge": ("servo_catalog.merge", "mescla os JSONs garimpados no servos.json"),
+    "db": ("servo_catalog.store", "importa/exporta o banco SQLite (import | export)"),
+    "prefetch": ("servo_catalog.prefetch", "baixa as imagens que faltam"),
+    "thumbnails": ("servo_catalog.thumbnails", "gera o cache de miniaturas"),
+}
+
+def usage():
+    lines = ["uso: python -m servo_catalog <comando> [opções]", "", "comandos:"]
+    lines += [f"  {name:<11} {desc}" for name, (_, desc) in COMMANDS.items()]
+    return "\n".join(lines)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(usage(), file=sys.stderr if argv else sys.stdout)
+        return 2 if argv and argv[0] not in ("-h", "--help") else 0
+    module_name, _ = COMMANDS[argv[0]]
+    rest = argv[1:]
+    # schema/journal têm um subcomando próprio (migrate / compact)
+    if argv[0] in ("migrate", "compact"):
+        rest = [argv[0]] + rest
+    return importlib.import_module(module_name).main(rest)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,424 @@
+import os
+import json
+
+import numpy as np
+
+from . import sidecar, journal
+from .schema import N_SLOTS, as_typed, curve
+from .index import CatalogIndex
+from .neighbors import NeighborIndex
+from .pareto import pareto_front
+from .voltage import VoltageModel
+from .search import TextIndex
+from .facets import FacetIndex
+
+###############################################################################
+#                                  CONFIG                                     #
+###############################################################################
+package_dir = os.path.dirname(os.path.abspath(__file__))
+repo_dir = os.path.dirname(package_dir)
+
+DEFAULT_JSON_PATH = os.path.join(repo_dir, "Database", "servos.json")
+# Se o banco SQLite existir (python -m servo_catalog.store import), ele é a fonte
+DEFAULT_DB_PATH = os.path.join(repo_dir, "Database", "servos.db")
+
+# Colunas escalares: nome interno -> chave do JSON
+SCALAR_KEYS = {
+    "weight": "Weight (g)",
+    "length": "L (mm)",
+    "width": "C (mm)",
+    "height": "A (mm)",
+    "price": "Typical Price",
+}
+
+# Todas as colunas numéricas de uma dimensão (torque/speed = máximo entre os slots)
+COLUMNS = ("torque", "speed", "weight", "length", "width", "height", "price")
+
+# Filtros da tela "Consulta Database": nome do argumento -> (coluna, limite)
+# "min": valor ausente conta como 0 (reprova, a não ser com limite <= 0)
+# "max": valor ausente não elimina o servo
+FILTERS = {
+    "torque_min": ("torque", "min"),
+    "torque_max": ("torque", "max"),
+    "weight_max": ("weight", "max"),
+    "length_max": ("length", "max"),
+    "width_max": ("width", "max"),
+    "height_max": ("height", "max"),
+    "speed_min": ("speed", "min"),
+    "price_max": ("price", "max"),
+}
+
+# Abaixo desta fração de linhas candidatas a busca pelo índice compensa o scan
+INDEX_SELECTIVITY = 0.10
+
+###############################################################################
+#                               CATÁLOGO                                      #
+###############################################################################
+class ServoCatalog:
+    """
+    Catálogo de servos em formato colunar.
+
+    O JSON é lido uma única vez e convertido em colunas NumPy (float64, NaN
+    para valores ausentes) + uma máscara de validade por coluna. As consultas
+    trabalham apenas sobre esses vetores, sem tocar no JSON.
+    """
+
+    def __init__(self, records, columns, slots):
+        self.records = records
+        self.columns = columns
+        self.slots = slots
+        self.valid = {name: ~np.isnan(col) for name, col in columns.items()}
+        self._index = None
+        self._neighbors = None
+        self._voltage_models = None
+        self._text_index = None
+        self._facets = (None, None)
+        self._at_voltage = (None, columns, self.valid)
+        # Só no catálogo carregado do SQLite (store.py): id de cada linha e o banco
+        self.row_ids = None
+        self.db_path = None
+        # (caminho, mtime/tamanho...) de load_catalog; chave do cache de consultas
+        self.source_key = None
+
+    def __len__(self):
+        return len(self.columns["weight"])
+
+    # ------------------------------- #
+    #  Construção
+    # ------------------------------- #
+    @classmethod
+    def from_records(cls, records):
+        n = len(records)
+        slots = {
+            "torque": np.full((n, N_SLOTS), np.nan),
+            "speed": np.full((n, N_SLOTS), np.nan),
+            "volt_torque": np.full((n, N_SLOTS), np.nan),
+            "volt_speed": np.full((n, N_SLOTS), np.nan),
+        }
+        scalars = {name: np.full(n, np.nan) for name in SCALAR_KEYS}
+
+        for i, row in enumerate(records):
+            # Registros v2 (schema.py) já vêm tipados; antigos são convertidos aqui
+            row = as_typed(row)
+            for name, key in SCALAR_KEYS.items():
+                value = row.get(key)
+                if value is not None:
+                    scalars[name][i] = value
+            for name in ("torque", "speed"):
+                volts, values = curve(row, name)
+                for j, (v, y) in enumerate(zip(volts[:N_SLOTS], values[:N_SLOTS])):
+                    if y is not None:
+                        slots[name][i, j] = y
+                    if v is not None:
+                        slots[f"volt_{name}"][i, j] = v
+
+        columns = dict(scalars)
+        columns["torque"] = _nanmax_rows(slots["torque"])
+        columns["speed"] = _nanmax_rows(slots["speed"])
+        return cls(records, columns, slots)
+
+    @classmethod
+    def from_json(cls, json_path=DEFAULT_JSON_PATH):
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls.from_records(data.get("servos", []))
+
+    @classmethod
+    def from_arrays(cls, arrays, records):
+        """Reconstrói o catálogo a partir de to_arrays() (ex.: vetores mmap do sidecar)."""
+        columns = {name: arrays[name] for name in COLUMNS}
+        slots = {
+            name[len("slots_"):]: arr
+            for name, arr in arrays.items() if name.startswith("slots_")
+        }
+        return cls(records, columns, slots)
+
+    def to_arrays(self):
+        arrays = dict(self.columns)
+        arrays.update({f"slots_{name}": arr for name, arr in self.slots.items()})
+        return arrays
+
+    def extended(self, records):
+        """Novo catálogo com `records` acrescentados ao fim (ex.: diário de cadastros)."""
+        extra = ServoCatalog.from_records(records).to_arrays()
+        arrays = {name: np.concatenate([arr, extra[name]]) for name, arr in self.to_arrays().items()}
+        return ServoCatalog.from_arrays(arrays, list(self.records) + list(records))
+
+    # ------------------------------- #
+    #  Consultas
+    # ------------------------------- #
+    def record(self, i):
+        return self.records[int(i)]
+
+    @property
+    def voltage_models(self):
+        """Modelos tensão->torque/velocidade por servo, montados uma vez por carga."""
+        if self._voltage_models is None:
+            self._voltage_models = {
+                "torque": VoltageModel(self.slots["volt_torque"], self.slots["torque"]),
+                "speed": VoltageModel(self.slots["volt_speed"], self.slots["speed"]),
+            }
+        return self._voltage_models
+
+    def columns_at(self, bus_voltage=None):
+        """
+        (colunas, máscaras de validade) com torque e velocidade avaliados na
+        tensão de barramento. Sem tensão, torque/velocidade são os máximos
+        entre os slots (comportamento original).
+        """
+        if bus_voltage is None:
+            return self.columns, self.valid
+        if self._at_voltage[0] == bus_voltage:
+            return self._at_voltage[1], self._at_voltage[2]
+
+        columns = dict(self.columns)
+        valid = dict(self.valid)
+        for name, model in self.voltage_models.items():
+            columns[name] = model.at(bus_voltage)
+            valid[name] = ~np.isnan(columns[name])
+        self._at_voltage = (bus_voltage, columns, valid)
+        return columns, valid
+
+    def filter_mask(self, bus_voltage=None, **filters):
+        """
+        Máscara booleana com todos os filtros da tela "Consulta Database"
+        (argumentos de FILTERS; None = filtro desligado). Com bus_voltage,
+        torque e velocidade são avaliados nessa tensão.
+
+        Mantém a semântica original: torque/velocidade ausentes contam como 0
+        (reprovam num mínimo positivo, passam em torque_min=0), enquanto peso,
+        dimensões e preço ausentes não eliminam o servo.
+        """
+        columns, valid = self.columns_at(bus_voltage)
+        mask = np.ones(len(self), dtype=bool)
+        for arg, limit in filters.items():
+            if limit is not None:
+                mask &= _limit_mask(columns, valid, arg, limit)
+        return mask
+
+    def filter_scan(self, bus_voltage=None, **filters):
+        """Índices dos servos que passam nos filtros, por varredura completa."""
+        return np.flatnonzero(self.filter_mask(bus_voltage, **filters))
+
+    def filter_indexed(self, **filters):
+        """Mesmo resultado de filter_scan, via índices ordenados."""
+        return self.index.query(self._ranges(filters))
+
+    def filter(self, bus_voltage=None, **filters):
+        """
+        Índices (em ordem do catálogo) dos servos que passam nos filtros.
+        Usa o índice quando o predicado mais seletivo deixa poucas linhas
+        candidatas; caso contrário a varredura vetorizada é mais barata.
+        Os índices cobrem os valores máximos de torque/velocidade, então com
+        bus_voltage esses dois filtros sempre vão por varredura.
+        """
+        ranges = self._ranges(filters)
+        if not ranges:
+            return np.arange(len(self))
+        if bus_voltage is not None and ranges.keys() & self.voltage_models.keys():
+            return self.filter_scan(bus_voltage, **filters)
+        if self.db_path is not None:
+            return self.filter_sql(**filters)
+        best, _ = self.index.plan(ranges)[0]
+        if best <= INDEX_SELECTIVITY * len(self):
+            return self.index.query(ranges)
+        return self.filter_scan(**filters)
+
+    def filter_sql(self, **filters):
+        """Mesmo resultado de filter_scan, via consultas por faixa nos índices do SQLite."""
+        from .store import CatalogStore
+
+        if len(self) == 0:
+            return np.arange(0)
+        with CatalogStore(self.db_path) as store:
+            # Servos inseridos depois desta carga ainda não estão nas colunas
+            ids = store.filter_ids(max_id=self.row_ids[-1], **filters)
+        idx = np.searchsorted(self.row_ids, ids)
+        return idx[self.row_ids[idx] == ids]
+
+    @property
+    def index(self):
+        """Índices ordenados, construídos na primeira consulta (uma vez por carga)."""
+        if self._index is None:
+            self._index = CatalogIndex(self.columns)
+        return self._index
+
+    def facet_index(self, bus_voltage=None):
+        """Faixas dos histogramas (facets.py), montadas uma vez por carga/tensão."""
+        if self._facets[1] is None or self._facets[0] != bus_voltage:
+            columns, _ = self.columns_at(bus_voltage)
+            self._facets = (bus_voltage, FacetIndex({name: columns[name] for name in COLUMNS}))
+        return self._facets[1]
+
+    def facets(self, bus_voltage=None, **filters):
+        """
+        Histograma de cada coluna de COLUMNS com os filtros atuais, menos os
+        da própria coluna (quantos servos há de cada lado do limite que está
+        sendo ajustado). {coluna: {"edges", "counts", "missing", "passing"}},
+        com passing = quantos desses passam também nos filtros da coluna.
+        """
+        columns, valid = self.columns_at(bus_voltage)
+        masks = {
+            arg: _limit_mask(columns, valid, arg, limit)
+            for arg, limit in filters.items() if limit is not None
+        }
+        all_mask = np.ones(len(self), dtype=bool)
+        for m in masks.values():
+            all_mask &= m
+        passing = int(all_mask.sum())
+
+        index = self.facet_index(bus_voltage)
+        out = {}
+        for name in COLUMNS:
+            mask = np.ones(len(self), dtype=bool)
+            for arg, m in masks.items():
+                if FILTERS[arg][0] != name:
+                    mask &= m
+            edges, counts, missing = index.histogram(name, mask)
+            out[name] = {"edges": edges, "counts": counts, "missing": missing, "passing": passing}
+        return out
+
+    @property
+    def neighbors(self):
+        """k-d tree das specs padronizadas, construída uma vez por carga."""
+        if self._neighbors is None:
+            self._neighbors = NeighborIndex(self.columns)
+        return self._neighbors
+
+    def similar(self, i, k=10):
+        """(índices, distâncias) dos k servos mais parecidos com o servo i."""
+        return self.neighbors.similar_to(int(i), k)
+
+    def nearest(self, spec, k=10):
+        """(índices, distâncias) dos k servos mais próximos de uma spec avulsa
+        ({"weight": 55, "torque": 10, ...}; chaves de neighbors.FEATURES)."""
+        return self.neighbors.nearest(spec, k)
+
+    @property
+    def text_index(self):
+        """Índice de trigramas de Make/Model/Link, montado na primeira busca."""
+        if self._text_index is None:
+            self._text_index = TextIndex(self.records)
+        return self._text_index
+
+    def search(self, text, indices=None, limit=None):
+        """
+        Busca textual (prefixo + aproximada) ordenada por relevância.
+        Com `indices` (ex.: resultado de filter), só devolve servos desse conjunto.
+        """
+        found = self.text_index.search(text)
+        if indices is not None:
+            allowed = np.zeros(len(self), dtype=bool)
+            allowed[np.asarray(indices, dtype=int)] = True
+            found = found[allowed[found]]
+        return found if limit is None else found[:limit]
+
+    def pareto(self, indices, objectives=("torque", "weight"), bus_voltage=None):
+        """Servos de `indices` não dominados nos objetivos (chaves de pareto.OBJECTIVES)."""
+        columns, _ = self.columns_at(bus_voltage)
+        return pareto_front(columns, indices, objectives)
+
+    def _ranges(self, filters):
+        """Converte os filtros em {coluna: (lo, hi, keep_missing)}."""
+        ranges = {}
+        for arg, limit in filters.items():
+            if limit is None:
+                continue
+            name, kind = FILTERS[arg]
+            lo, hi, _ = ranges.get(name, (None, None, True))
+            if kind == "min":
+                lo = limit
+            else:
+                hi = limit
+            ranges[name] = (lo, hi, lo is None or lo <= 0)
+        return ranges
+
+def _limit_mask(columns, valid, arg, limit):
+    """Máscara de um filtro (argumento de FILTERS) com a semântica de filter_mask."""
+    name, kind = FILTERS[arg]
+    if kind == "min":
+        passes = valid[name] & (columns[name] >= limit)
+        return passes | ~valid[name] if limit <= 0 else passes  # ausente = 0
+    return ~valid[name] | (columns[name] <= limit)
+
+def _nanmax_rows(matrix):
+    """Máximo por linha ignorando NaN; linha toda NaN continua NaN (sem warning)."""
+    has_value = ~np.isnan(matrix).all(axis=1)
+    out = np.full(matrix.shape[0], np.nan)
+    if has_value.any():
+        out[has_value] = np.nanmax(matrix[has_value], axis=1)
+    return out
+
+###############################################################################
+#                          CACHE POR ARQUIVO (mtime)                          #
+###############################################################################
+_loaded = {}
+
+def default_catalog_path():
+    """Catálogo em uso: Database/servos.db se existir, senão Database/servos.json."""
+    return DEFAULT_DB_PATH if os.path.exists(DEFAULT_DB_PATH) else DEFAULT_JSON_PATH
+
+def load_catalog(json_path=None, use_sidecar=True):
+    """
+    Retorna o catálogo do arquivo (padrão: default_catalog_path()), relendo
+    apenas se ele mudou (mtime/tamanho). Chamadas seguidas custam só um os.stat.
+
+    Com use_sidecar=True o primeiro carregamento abre o cache binário via
+    mmap; o JSON só é parseado (e o cache regravado) quando o sidecar está
+    ausente ou desatualizado.
+
+    Um caminho .db é lido do banco SQLite (store.py); inserções recentes
+    ficam no arquivo -wal, que também entra na chave. Para o JSON, os
+    cadastros do diário (journal.py) são somados à base.
+    """
+    path = os.path.abspath(json_path or default_catalog_path())
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    is_db = path.endswith(".db")
+    if is_db:
+        try:
+            wal = os.stat(path + "-wal")
+            key += (wal.st_mtime_ns, wal.st_size)
+        except OSError:
+            pass
+    else:
+        key += journal.state_key(path)
+    cached = _loaded.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    if is_db:
+        from .store import CatalogStore
+
+        with CatalogStore(path) as store:
+            arrays, records, ids = store.load_arrays()
+        catalog = ServoCatalog.from_arrays(arrays, records)
+        catalog.row_ids = ids
+        catalog.db_path = path
+        catalog.source_key = (path,) + key
+        _loaded[path] = (key, catalog)
+        return catalog
+
+    catalog = None
+    if use_sidecar:
+        found = sidecar.read_sidecar(path, st)
+        if found is not None:
+            catalog = ServoCatalog.from_arrays(*found)
+
+    if catalog is None:
+        # Parse e impressão digital do sidecar saem dos mesmos bytes
+        raw, source_stat, sha1 = sidecar.read_source(path)
+        catalog = ServoCatalog.from_records(json.loads(raw).get("servos", []))
+        if use_sidecar:
+            try:
+                sidecar.write_sidecar(path, catalog.to_arrays(), catalog.records, source_stat, sha1)
+            except OSError as e:
+                print(f"[AVISO] Não foi possível gravar o cache de {path}: {e}")
+
+    extra = journal.pending_records(path)
+    if extra:
+        catalog = catalog.extended(extra)
+
+    catalog.source_key = (path,) + key
+    _loaded[path] = (key, catalog)
+    return catalog
@@ -0,0 +1,47 @@
+"""
+Histogramas por dimensão (facetas) para a tela de filtros.
+
+As faixas de cada coluna são fixadas uma vez por carga (entre os percentis
+FACET_RANGE, para um servo de 1,7 m não achatar o resto; valores fora caem
+nas faixas das pontas) e o número da faixa de cada servo fica guardado.
+Recontar para outro filtro é só um np.bincount sobre a máscara: poucos
+microssegundos por dimensão, sem refazer a consulta.
+"""
+import numpy as np
+
+N_BINS = 24
+FACET_RANGE = (1, 99)  # percentis que definem o intervalo das faixas
+
+def bin_edges(values, n_bins=N_BINS):
+    """Bordas das faixas de uma coluna (NaN ignorado; coluna vazia -> 0..1)."""
+    finite = values[~np.isnan(values)]
+    if len(finite) == 0:
+        return np.linspace(0.0, 1.0, n_bins + 1)
+    lo, hi = np.percentile(finite, FACET_RANGE)
+    if hi <= lo:
+        hi = lo + 1.0
+    return np.linspace(lo, hi, n_bins + 1)
+
+class FacetIndex:
+    """
+    Faixa de cada servo em cada coluna de `columns` (int16; N_BINS = valor
+    ausente), calculada uma vez. histogram() conta só as linhas da máscara.
+    """
+
+    def __init__(self, columns, n_bins=N_BINS):
+        self.n_bins = n_bins
+        self.edges = {}
+        self.bins = {}
+        for name, values in columns.items():
+            values = np.asarray(values, dtype=float)
+            edges = bin_edges(values, n_bins)
+            bins = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, n_bins - 1)
+            bins[np.isnan(values)] = n_bins
+            self.edges[name] = edges
+            self.bins[name] = bins.astype(np.int16)
+
+    def histogram(self, name, mask=None):
+        """(bordas, contagens por faixa, quantos sem valor) das linhas de `mask`."""
+        bins = self.bins[name] if mask is None else self.bins[name][mask]
+        counts = np.bincount(bins, minlength=self.n_bins + 1)
+        return self.edges[name], counts[:self.n_bins], int(counts[self.n_bins])
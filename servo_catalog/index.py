@@ -0,0 +1,81 @@
+"""
+Índices ordenados por atributo para as consultas de faixa do catálogo.
+
+Cada coluna guarda a permutação que a ordena (NaN no fim) e os valores já
+ordenados; uma faixa [lo, hi] vira dois bisects (np.searchsorted). A
+consulta começa pelo predicado mais seletivo e só avalia os demais sobre
+esse conjunto de candidatos, então filtros apertados tocam poucas linhas.
+"""
+import numpy as np
+
+class SortedIndex:
+    def __init__(self, values):
+        self.order = np.argsort(values, kind="stable")  # NaN vai para o fim
+        self.sorted = values[self.order]
+        self.n_valid = int(np.count_nonzero(~np.isnan(values)))
+
+    def bounds(self, lo=None, hi=None):
+        """Posições [start, end) em `sorted` com lo <= valor <= hi (só válidos)."""
+        valid = self.sorted[:self.n_valid]
+        start = 0 if lo is None else int(np.searchsorted(valid, lo, side="left"))
+        end = self.n_valid if hi is None else int(np.searchsorted(valid, hi, side="right"))
+        return start, max(start, end)
+
+    def rows(self, lo=None, hi=None, keep_missing=False):
+        start, end = self.bounds(lo, hi)
+        found = self.order[start:end]
+        if keep_missing and self.n_valid < len(self.order):
+            found = np.concatenate([found, self.order[self.n_valid:]])
+        return found
+
+    def count(self, lo=None, hi=None, keep_missing=False):
+        start, end = self.bounds(lo, hi)
+        missing = len(self.order) - self.n_valid if keep_missing else 0
+        return end - start + missing
+
+class CatalogIndex:
+    """Conjunto de SortedIndex (um por coluna) + planejador de consultas."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.indexes = {name: SortedIndex(np.asarray(col)) for name, col in columns.items()}
+        self.n = len(next(iter(columns.values()))) if columns else 0
+
+    def plan(self, ranges):
+        """
+        ranges: {coluna: (lo, hi, keep_missing)}.
+        Retorna [(contagem, coluna), ...] do mais para o menos seletivo.
+        """
+        plan = [
+            (self.indexes[name].count(lo, hi, keep_missing), name)
+            for name, (lo, hi, keep_missing) in ranges.items()
+        ]
+        plan.sort()
+        return plan
+
+    def query(self, ranges):
+        """Índices (ordenados, em ordem do catálogo) que satisfazem todas as faixas."""
+        if not ranges:
+            return np.arange(self.n)
+
+        plan = self.plan(ranges)
+        _, first = plan[0]
+        lo, hi, keep_missing = ranges[first]
+        candidates = self.indexes[first].rows(lo, hi, keep_missing)
+
+        # Demais predicados avaliados só sobre os candidatos
+        for _, name in plan[1:]:
+            if candidates.size == 0:
+                break
+            lo, hi, keep_missing = ranges[name]
+            values = np.asarray(self.columns[name])[candidates]
+            ok = np.ones(candidates.size, dtype=bool)
+            if lo is not None:
+                ok &= values >= lo
+            if hi is not None:
+                ok &= values <= hi
+            if keep_missing:
+                ok |= np.isnan(values)
+            candidates = candidates[ok]
+
+        return np.sort(candidates)
@@ -0,0 +1,252 @@
+"""
+Diário (journal) de cadastros do servos.json.
+
+Cadastrar um servo acrescenta uma linha JSON em `<nome>.journal.jsonl`, ao
+lado do catálogo, em vez de reescrever o servos.json inteiro: o custo não
+cresce com o catálogo e uma queda no meio da escrita só perde a última
+linha (incompleta, ignorada na leitura). load_catalog junta base + diário.
+
+A compactação incorpora o diário na base de forma atômica:
+1. renomeia o diário para `.<id>.compacting`, com um id único por leva
+   (novos cadastros vão para um diário novo);
+2. grava a base com esses registros num arquivo temporário + os.replace,
+   anotando em "journal_applied" o id da leva incorporada;
+3. apaga o `.compacting`.
+Se o processo cair entre 2 e 3, o id anotado evita contar os registros
+duas vezes; a próxima compactação só termina o passo 3. O id não depende do
+conteúdo: dois diários com os mesmos bytes (o mesmo servo cadastrado de
+novo) são levas diferentes.
+
+Cadastro, leitura do diário e compactação seguram um lock exclusivo em
+`<diário>.lock` (flock / msvcrt.locking). Sem ele, um cadastro aberto antes
+do passo 1 escreveria no arquivo renomeado depois da leitura e seria apagado
+no passo 3, e duas compactações ao mesmo tempo (launcher + CLI) aplicariam
+a mesma leva duas vezes.
+
+    python -m servo_catalog compact [Database/servos.json]
+"""
+import os
+import sys
+import glob
+import json
+import time
+import uuid
+import argparse
+import threading
+import contextlib
+
+from .schema import SCHEMA_VERSION, normalize_record, write_document
+
+# Compactação automática (ex.: na abertura do launcher) a partir de N linhas
+COMPACT_MIN_RECORDS = 50
+
+###############################################################################
+#                                  CAMINHOS                                   #
+###############################################################################
+def journal_path(json_path):
+    return os.path.splitext(json_path)[0] + ".journal.jsonl"
+
+def lock_path(json_path):
+    return journal_path(json_path) + ".lock"
+
+def new_batch_id():
+    # Ordena pela hora da compactação; o uuid garante que não se repete
+    return f"{time.time_ns():020d}-{uuid.uuid4().hex}"
+
+def compacting_path(json_path, batch_id):
+    return f"{journal_path(json_path)}.{batch_id}.compacting"
+
+def compacting_batches(json_path):
+    """[(id da leva, caminho)] das compactações em andamento/interrompidas, da mais antiga."""
+    prefix = journal_path(json_path) + "."
+    batches = []
+    for path in glob.glob(glob.escape(prefix) + "*.compacting"):
+        batches.append((path[len(prefix):-len(".compacting")], path))
+    return sorted(batches)
+
+def state_key(json_path):
+    """(mtime, tamanho) do diário e dos .compacting, para a chave do cache de carga."""
+    key = ()
+    for path in [journal_path(json_path)] + [path for _, path in compacting_batches(json_path)]:
+        try:
+            st = os.stat(path)
+            key += (st.st_mtime_ns, st.st_size)
+        except OSError:
+            key += (None, None)
+    return key
+
+###############################################################################
+#                                    LOCK                                     #
+###############################################################################
+_held = threading.local()  # locks já seguros por esta thread (locked() reentrante)
+
+@contextlib.contextmanager
+def locked(json_path):
+    """
+    Lock exclusivo entre processos do diário de `json_path` (espera se
+    ocupado). Reentrante na mesma thread: compact() dentro de locked() não trava.
+    """
+    path = os.path.abspath(lock_path(json_path))
+    held = _held.__dict__.setdefault("paths", set())
+    if path in held:
+        yield
+        return
+    held.add(path)
+    try:
+        with _file_lock(path):
+            yield
+    finally:
+        held.discard(path)
+
+@contextlib.contextmanager
+def _file_lock(path):
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # tenta por ~10 s
+                    break
+                except OSError:
+                    pass
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+###############################################################################
+#                              LEITURA / ESCRITA                              #
+###############################################################################
+def append(json_path, record):
+    """Acrescenta um servo ao diário (uma linha, com fsync)."""
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    with locked(json_path), open(journal_path(json_path), "a+b") as f:
+        # Última linha incompleta (queda no meio de uma escrita): não cola nela
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+def _read_lines(path):
+    """Registros do arquivo; linhas que não são JSON válido são ignoradas."""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return []
+    records = []
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line.decode("utf-8")))
+        except ValueError:
+            # Escrita interrompida: a linha parcial fica de fora
+            print(f"[AVISO] Linha inválida ignorada em {path}")
+    return records
+
+def _read_base(json_path):
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = {"schema_version": SCHEMA_VERSION}
+    data.setdefault("servos", [])
+    return data
+
+def pending_records(json_path):
+    """Registros do diário que ainda não estão na base, em ordem de cadastro."""
+    if not os.path.exists(journal_path(json_path)) and not compacting_batches(json_path):
+        return []  # sem diário: não cria o .lock só para ler
+    with locked(json_path):
+        return _pending_records(json_path)
+
+def _pending_records(json_path):
+    records = []
+    batches = compacting_batches(json_path)
+    if batches:
+        # Compactação em andamento ou interrompida: só conta se não foi aplicada
+        applied = _read_base(json_path).get("journal_applied")
+        for batch_id, path in batches:
+            if batch_id != applied:
+                records += _read_lines(path)
+    records += _read_lines(journal_path(json_path))
+    return records
+
+def read_all(json_path):
+    """Base + diário, como lista de registros."""
+    return _read_base(json_path)["servos"] + pending_records(json_path)
+
+###############################################################################
+#                                 COMPACTAÇÃO                                 #
+###############################################################################
+def compact(json_path):
+    """Incorpora o diário na base. Retorna quantos registros foram incorporados."""
+    with locked(json_path):
+        return _compact(json_path)
+
+def _compact(json_path):
+    journal = journal_path(json_path)
+    batches = compacting_batches(json_path)
+    if not batches:
+        if not os.path.exists(journal) or os.path.getsize(journal) == 0:
+            return 0
+        batch_id = new_batch_id()
+        os.replace(journal, compacting_path(json_path, batch_id))
+        batches = [(batch_id, compacting_path(json_path, batch_id))]
+
+    # Levas interrompidas antes desta (normalmente nenhuma), da mais antiga
+    added = 0
+    for batch_id, path in batches:
+        data = _read_base(json_path)
+        if data.get("journal_applied") != batch_id:
+            records = _read_lines(path)
+            data["servos"].extend(normalize_record(r) for r in records)
+            data["journal_applied"] = batch_id
+            write_document(json_path, data)
+            added += len(records)
+        os.remove(path)
+    return added
+
+def compact_if_needed(json_path, min_records=COMPACT_MIN_RECORDS):
+    """Compacta se houver compactação interrompida ou diário com >= min_records linhas."""
+    try:
+        if compacting_batches(json_path):
+            return compact(json_path)
+        with open(journal_path(json_path), "rb") as f:
+            lines = sum(1 for _ in f)
+        if lines >= min_records:
+            return compact(json_path)
+    except OSError:
+        pass
+    return 0
+
+def main(argv=None):
+    from .catalog import DEFAULT_JSON_PATH
+
+    parser = argparse.ArgumentParser(description="Diário de cadastros do servos.json.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_compact = sub.add_parser("compact", help="incorpora o diário no servos.json")
+    p_compact.add_argument("json_path", nargs="?", default=DEFAULT_JSON_PATH)
+    args = parser.parse_args(argv)
+
+    added = compact(args.json_path)
+    print(f"{added} servo(s) incorporado(s) em {args.json_path}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
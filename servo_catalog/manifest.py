@@ -0,0 +1,136 @@
+"""
+Manifesto de Database/Images e Database/Datasheets.
+
+Um único scan na inicialização monta modelo -> primeira imagem e
+modelo -> datasheet, então desenhar um card não faz listdir/exists. Para
+pegar alterações feitas por fora (Cadastrar Servo, cópia manual...), as
+consultas conferem o mtime das duas pastas no máximo uma vez a cada
+RECHECK_SECONDS e refazem o scan se algo mudou. Uma imagem gravada dentro
+de uma pasta de modelo que já existia não muda o mtime de Images/, então
+antes de responder "sem imagem" image_for() confere o mtime daquela pasta
+(prefetch, cópia manual, download do crawler). Quem grava uma imagem nova
+pelo app também pode avisar com record_image().
+"""
+import os
+import time
+import threading
+
+from .catalog import repo_dir
+from .thumbnails import IMAGES_DIR, IMAGE_EXTENSIONS, first_image
+
+DATASHEETS_DIR = os.path.join(repo_dir, "Database", "Datasheets")
+RECHECK_SECONDS = 2.0
+
+def safe_model_name(model_name):
+    """Nome da pasta de imagens do modelo (mesma regra do download de imagens)."""
+    return model_name.replace(" ", "_").replace("/", "_")
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+class MediaManifest:
+    def __init__(self, images_dir=IMAGES_DIR, datasheets_dir=DATASHEETS_DIR, scan=True):
+        self.images_dir = images_dir
+        self.datasheets_dir = datasheets_dir
+        self.lock = threading.Lock()
+        self.images = {}       # pasta do modelo -> caminho da imagem ou None (pasta vazia)
+        self.datasheets = {}   # nome do arquivo sem .pdf -> caminho
+        self.empty_mtimes = {}  # pasta sem imagem -> mtime dela quando foi vista vazia
+        self.dir_mtimes = None
+        self.last_check = 0.0
+        # scan=False: o primeiro acesso (ou um rescan() em segundo plano) faz o scan
+        if scan:
+            self.rescan()
+
+    ###########################################################################
+    #                                   SCAN                                  #
+    ###########################################################################
+    def rescan(self):
+        images = {}
+        empty_mtimes = {}
+        loose = {}
+        try:
+            entries = list(os.scandir(self.images_dir))
+        except OSError:
+            entries = []
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir():
+                images[entry.name] = first_image(entry.path)
+                if images[entry.name] is None:
+                    empty_mtimes[entry.name] = _mtime(entry.path)
+            elif entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                # Cadastrar Servo grava Images/<modelo>.jpg direto na raiz
+                loose.setdefault(os.path.splitext(entry.name)[0], entry.path)
+        for name, path in loose.items():
+            if images.get(name) is None:
+                images[name] = path
+
+        datasheets = {}
+        try:
+            for entry in os.scandir(self.datasheets_dir):
+                if entry.is_file() and entry.name.lower().endswith(".pdf"):
+                    datasheets[os.path.splitext(entry.name)[0]] = entry.path
+        except OSError:
+            pass
+
+        with self.lock:
+            self.images = images
+            self.empty_mtimes = empty_mtimes
+            self.datasheets = datasheets
+            self.dir_mtimes = (_mtime(self.images_dir), _mtime(self.datasheets_dir))
+            self.last_check = time.monotonic()
+
+    def refresh_if_stale(self):
+        """Confere o mtime das pastas (no máx. a cada RECHECK_SECONDS)."""
+        now = time.monotonic()
+        if now - self.last_check < RECHECK_SECONDS:
+            return
+        self.last_check = now
+        if (_mtime(self.images_dir), _mtime(self.datasheets_dir)) != self.dir_mtimes:
+            self.rescan()
+
+    ###########################################################################
+    #                                CONSULTAS                                #
+    ###########################################################################
+    def image_for(self, model_name):
+        """Caminho da imagem do modelo ou None (sem pasta ou pasta sem imagem)."""
+        self.refresh_if_stale()
+        name = safe_model_name(model_name)
+        path = self.images.get(name)
+        if path is None and name in self.images:
+            path = self._recheck_empty(name)
+        return path
+
+    def _recheck_empty(self, name):
+        """Pasta vista vazia: se o mtime dela mudou, procura a imagem de novo."""
+        folder = os.path.join(self.images_dir, name)
+        mtime = _mtime(folder)
+        if mtime is not None and mtime == self.empty_mtimes.get(name):
+            return None
+        found = first_image(folder) if mtime is not None else None
+        with self.lock:
+            if found:
+                self.images[name] = found
+                self.empty_mtimes.pop(name, None)
+            else:
+                self.empty_mtimes[name] = mtime
+        return found
+
+    def has_image_folder(self, model_name):
+        self.refresh_if_stale()
+        return safe_model_name(model_name) in self.images
+
+    def datasheet_for(self, model_name):
+        self.refresh_if_stale()
+        return self.datasheets.get(model_name) or self.datasheets.get(safe_model_name(model_name))
+
+    def record_image(self, model_name, path):
+        """Registra uma imagem gravada pelo próprio app (ex.: download)."""
+        with self.lock:
+            self.images[safe_model_name(model_name)] = path
+            self.empty_mtimes.pop(safe_model_name(model_name), None)
@@ -0,0 +1,213 @@
+"""
+Mescla de catálogos (upsert com deduplicação) para o servos.json.
+
+A identidade de um servo é (Make, Model) normalizados como na busca
+("Savöx SC-1256TG" == "savox sc1256tg"). Cada registro tem um hash do
+conteúdo (registro v2 serializado com chaves ordenadas). Numa única
+passada pelos registros que chegam:
+
+- identidade nova                       -> inserido;
+- identidade existente, conteúdo igual   -> ignorado;
+- identidade existente, conteúdo mudou   -> atualizado.
+
+Na atualização, campos vazios (null / lista vazia) do registro novo não
+apagam o que já existe: o garimpo de um site costuma trazer só parte das
+specs. O custo é linear no número de registros (dicionário por identidade).
+
+Se existir o banco SQLite ao lado do catálogo (Database/servos.db, que o
+launcher usa no lugar do JSON), a mesma mescla é feita nele: UPDATE dos
+servos alterados e INSERT dos novos, sem apagar o que foi cadastrado
+direto no banco.
+
+Para juntar os JSONs garimpados (Database/Data/<site>/servoshtml/servos.json):
+    python -m servo_catalog.merge [--into Database/servos.json] [--dry-run] [arquivos...]
+"""
+import os
+import sys
+import json
+import glob
+import hashlib
+import argparse
+
+from . import journal
+from .catalog import repo_dir, DEFAULT_JSON_PATH
+from .schema import SCHEMA_VERSION, normalize_record, write_document
+from .search import normalize
+
+SCRAPED_GLOB = os.path.join(repo_dir, "Database", "Data", "*", "servoshtml", "servos.json")
+
+###############################################################################
+#                             IDENTIDADE / HASH                               #
+###############################################################################
+def identity(record):
+    return normalize(record.get("Make")), normalize(record.get("Model"))
+
+def content_hash(record):
+    """sha1 do registro (já no esquema v2) serializado de forma canônica."""
+    text = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def _is_empty(value):
+    return value is None or value == [] or value == ""
+
+def overlay(existing, incoming):
+    """`existing` com os campos preenchidos de `incoming` por cima."""
+    merged = dict(existing)
+    for key, value in incoming.items():
+        if not _is_empty(value):
+            merged[key] = value
+    # Curvas andam em par: trocar os valores sem as tensões desalinharia a lista
+    for volts_key, values_key in (("TensãoTorque", "Torque (kgf.cm)"), ("TensãoSpeed", "Speed (°/s)")):
+        if not _is_empty(incoming.get(values_key)) or not _is_empty(incoming.get(volts_key)):
+            merged[volts_key] = incoming.get(volts_key) or []
+            merged[values_key] = incoming.get(values_key) or []
+    return merged
+
+###############################################################################
+#                                   MESCLA                                    #
+###############################################################################
+class CatalogMerger:
+    """
+    Catálogo em memória indexado por identidade. add() faz o upsert de uma
+    leva de registros e devolve as contagens dela; `records` é a lista final
+    (esquema v2), com a ordem da base mantida e os inseridos no fim;
+    `updated` guarda as posições da base que mudaram.
+    """
+
+    def __init__(self, base):
+        self.records = [normalize_record(r) for r in base]
+        self.hashes = [None] * len(self.records)  # calculados só quando a identidade bate
+        self.updated = set()
+        self.by_identity = {}
+        for pos, record in enumerate(self.records):
+            # Identidades repetidas na base (variantes) ficam todas; a 1ª recebe as atualizações
+            self.by_identity.setdefault(identity(record), []).append(pos)
+
+    def _hash(self, pos):
+        if self.hashes[pos] is None:
+            self.hashes[pos] = content_hash(self.records[pos])
+        return self.hashes[pos]
+
+    def add(self, incoming):
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        for raw in incoming:
+            record = normalize_record(raw)
+            key = identity(record)
+            if not key[1]:
+                counts["skipped"] += 1  # sem Model: não há como identificar
+                continue
+            positions = self.by_identity.get(key)
+            if positions is None:
+                self.by_identity[key] = [len(self.records)]
+                self.records.append(record)
+                self.hashes.append(None)
+                counts["inserted"] += 1
+                continue
+
+            new_hash = content_hash(record)
+            if any(self._hash(pos) == new_hash for pos in positions):
+                counts["unchanged"] += 1
+                continue
+            pos = positions[0]
+            merged = overlay(self.records[pos], record)
+            merged_hash = content_hash(merged)
+            if merged_hash == self._hash(pos):
+                counts["unchanged"] += 1
+            else:
+                self.records[pos] = merged
+                self.hashes[pos] = merged_hash
+                self.updated.add(pos)
+                counts["updated"] += 1
+        return counts
+
+def merge_records(base, incoming):
+    """(lista final, contagens) do upsert de `incoming` sobre `base`."""
+    merger = CatalogMerger(base)
+    counts = merger.add(incoming)
+    return merger.records, counts
+
+def read_records(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("servos", [])
+
+def db_path_for(json_path):
+    """Banco SQLite que acompanha o catálogo JSON (Database/servos.json -> servos.db)."""
+    return os.path.splitext(json_path)[0] + ".db"
+
+def _add_sources(merger, sources):
+    per_file, totals = {}, {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+    for path in sources:
+        per_file[path] = merger.add(read_records(path))
+        for name, count in per_file[path].items():
+            totals[name] += count
+    return totals, per_file
+
+def merge_into_store(db_path, sources=None, dry_run=False):
+    """
+    Mesma mescla de merge_files, no banco SQLite: os servos alterados são
+    regravados pelo id e os novos inseridos, numa transação. Servos
+    cadastrados direto no banco ficam. Retorna (contagens totais, {arquivo: contagens}).
+    """
+    from .store import CatalogStore
+
+    sources = sorted(glob.glob(SCRAPED_GLOB)) if sources is None else sources
+    with CatalogStore(db_path) as store:
+        ids, base = store.records_with_ids()
+        merger = CatalogMerger(base)
+        totals, per_file = _add_sources(merger, sources)
+        if not dry_run:
+            updates = [(ids[pos], merger.records[pos]) for pos in sorted(merger.updated) if pos < len(base)]
+            store.upsert(updates, merger.records[len(base):])
+    return totals, per_file
+
+def merge_files(json_path=DEFAULT_JSON_PATH, sources=None, dry_run=False):
+    """
+    Mescla os arquivos `sources` (padrão: todos os JSONs garimpados) no
+    catálogo. O diário de cadastros é compactado antes, e a gravação é
+    atômica. Retorna (contagens totais, {arquivo: contagens}).
+    """
+    sources = sorted(glob.glob(SCRAPED_GLOB)) if sources is None else sources
+    if dry_run:
+        base = journal.read_all(json_path) if os.path.exists(json_path) else []
+        merger = CatalogMerger(base)
+        return _add_sources(merger, sources)
+
+    # Cadastros feitos durante a mescla esperam o lock e vão para o diário;
+    # outra compactação não regrava a base no meio
+    with journal.locked(json_path):
+        journal.compact(json_path)
+        base = read_records(json_path) if os.path.exists(json_path) else []
+        merger = CatalogMerger(base)
+        totals, per_file = _add_sources(merger, sources)
+        if totals["inserted"] or totals["updated"]:
+            try:
+                with open(json_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                data = {}
+            data["schema_version"] = SCHEMA_VERSION
+            data["servos"] = merger.records
+            write_document(json_path, data)
+    return totals, per_file
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mescla catálogos garimpados no servos.json.")
+    parser.add_argument("sources", nargs="*", help="JSONs a mesclar (padrão: Database/Data/*/servoshtml/servos.json)")
+    parser.add_argument("--into", default=DEFAULT_JSON_PATH, help="catálogo de destino")
+    parser.add_argument("--dry-run", action="store_true", help="só mostra as contagens")
+    args = parser.parse_args(argv)
+
+    line = "{inserted} inseridos, {updated} atualizados, {unchanged} iguais, {skipped} sem modelo"
+    targets = [(args.into, merge_files)]
+    if os.path.exists(db_path_for(args.into)):
+        targets.append((db_path_for(args.into), merge_into_store))
+    for target, merge in targets:
+        totals, per_file = merge(target, args.sources or None, dry_run=args.dry_run)
+        print(f"== {os.path.relpath(target, repo_dir)}")
+        for path, counts in per_file.items():
+            print(f"{os.path.relpath(path, repo_dir)}: " + line.format(**counts))
+        print("Total: " + line.format(**totals) + (" (simulação)" if args.dry_run else ""))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
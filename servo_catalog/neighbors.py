@@ -0,0 +1,155 @@
+"""
+Busca de servos semelhantes (k vizinhos mais próximos).
+
+As especificações (peso, L/C/A, torque e velocidade máximos) são levadas
+para escala log e padronizadas (z-score), para que 10 g -> 20 g pese o
+mesmo que 100 g -> 200 g. Valores ausentes viram a média da coluna (0 após
+padronizar). Sobre esses pontos é montada uma k-d tree, uma vez por carga
+do catálogo.
+"""
+import heapq
+
+import numpy as np
+
+FEATURES = ("weight", "length", "width", "height", "torque", "speed")
+LEAF_SIZE = 16
+
+###############################################################################
+#                          NORMALIZAÇÃO DAS SPECS                             #
+###############################################################################
+class FeatureScaler:
+    def __init__(self, columns, features=FEATURES):
+        self.features = features
+        logs = [np.log1p(np.clip(np.asarray(columns[name]), 0, None)) for name in features]
+        self.mean = np.array([np.nanmean(col) if np.any(~np.isnan(col)) else 0.0 for col in logs])
+        std = np.array([np.nanstd(col) if np.any(~np.isnan(col)) else 1.0 for col in logs])
+        self.std = np.where(std > 0, std, 1.0)
+        self.points = self._standardize(np.column_stack(logs))
+
+    def _standardize(self, raw_log):
+        z = (raw_log - self.mean) / self.std
+        return np.where(np.isnan(z), 0.0, z)
+
+    def transform(self, spec):
+        """spec: {feature: valor}. Retorna (ponto padronizado, máscara das dims informadas)."""
+        raw = np.array([np.nan if spec.get(name) is None else float(spec[name]) for name in self.features])
+        given = ~np.isnan(raw)
+        return self._standardize(np.log1p(np.clip(raw, 0, None))), given
+
+###############################################################################
+#                                 K-D TREE                                    #
+###############################################################################
+class KDTree:
+    """
+    k-d tree simples em NumPy: nós internos dividem pela mediana da dimensão
+    de maior amplitude; folhas com até LEAF_SIZE pontos são comparadas de
+    forma vetorizada.
+    """
+
+    def __init__(self, points, leaf_size=LEAF_SIZE):
+        self.points = np.asarray(points, dtype=float)
+        self.leaf_size = leaf_size
+        self.perm = np.arange(len(self.points))
+        # Nó: (dim, split, left, right, start, end), dim = -1 para folhas;
+        # lo/hi = caixa envolvente dos pontos do nó
+        self.nodes = []
+        self.lo = []
+        self.hi = []
+        if len(self.points):
+            self._build(0, len(self.points))
+        self.lo = np.array(self.lo)
+        self.hi = np.array(self.hi)
+
+    def _build(self, start, end):
+        node_id = len(self.nodes)
+        idx = self.perm[start:end]
+        pts = self.points[idx]
+        lo, hi = pts.min(axis=0), pts.max(axis=0)
+        self.nodes.append((-1, 0.0, -1, -1, start, end))
+        self.lo.append(lo)
+        self.hi.append(hi)
+        if end - start <= self.leaf_size:
+            return node_id
+
+        dim = int(np.argmax(hi - lo))
+        if hi[dim] == lo[dim]:
+            return node_id  # pontos repetidos: vira folha
+        mid = (end - start) // 2
+        part = np.argpartition(pts[:, dim], mid)
+        self.perm[start:end] = idx[part]
+        split = self.points[self.perm[start + mid], dim]
+
+        left = self._build(start, start + mid)
+        right = self._build(start + mid, end)
+        self.nodes[node_id] = (dim, float(split), left, right, start, end)
+        return node_id
+
+    def query(self, point, k=10):
+        """Retorna (índices, distâncias) dos k pontos mais próximos de `point`."""
+        if not len(self.points):
+            return np.array([], dtype=int), np.array([])
+        k = min(k, len(self.points))
+        point = np.asarray(point, dtype=float)
+        best = []  # heap de (-dist², índice)
+        stack = [0]
+        while stack:
+            node_id = stack.pop()
+            # Distância do ponto à caixa do nó (poda)
+            gap = np.maximum(self.lo[node_id] - point, 0) + np.maximum(point - self.hi[node_id], 0)
+            box_d2 = float(gap @ gap)
+            if len(best) == k and box_d2 >= -best[0][0]:
+                continue
+
+            dim, split, left, right, start, end = self.nodes[node_id]
+            if dim < 0:
+                idx = self.perm[start:end]
+                diff = self.points[idx] - point
+                for d2, i in zip(np.einsum("ij,ij->i", diff, diff), idx):
+                    if len(best) < k:
+                        heapq.heappush(best, (-d2, i))
+                    elif d2 < -best[0][0]:
+                        heapq.heapreplace(best, (-d2, i))
+                continue
+
+            # Visita primeiro o lado do ponto (empilhado por último)
+            if point[dim] < split:
+                stack.extend((right, left))
+            else:
+                stack.extend((left, right))
+
+        best.sort(reverse=True)
+        indices = np.array([i for _, i in best], dtype=int)
+        dists = np.sqrt([-d for d, _ in best])
+        return indices, dists
+
+###############################################################################
+#                              API DE VIZINHOS                                #
+###############################################################################
+class NeighborIndex:
+    def __init__(self, columns, features=FEATURES):
+        self.scaler = FeatureScaler(columns, features)
+        self.tree = KDTree(self.scaler.points)
+
+    def similar_to(self, row, k=10):
+        """k servos mais parecidos com a linha `row` do catálogo (exclui ela mesma)."""
+        idx, dist = self.tree.query(self.scaler.points[row], k + 1)
+        keep = idx != row
+        return idx[keep][:k], dist[keep][:k]
+
+    def nearest(self, spec, k=10):
+        """
+        k servos mais próximos de uma especificação avulsa (ex.: servo testado
+        em Dados_bruto). Se faltar alguma dimensão, a distância usa só as
+        informadas (busca vetorizada, sem a árvore).
+        """
+        point, given = self.scaler.transform(spec)
+        if given.all():
+            return self.tree.query(point, k)
+        if not given.any():
+            raise ValueError("Informe ao menos uma especificação para a busca.")
+        diff = self.scaler.points[:, given] - point[given]
+        d2 = np.einsum("ij,ij->i", diff, diff)
+        k = min(k, len(d2))
+        idx = np.argpartition(d2, k - 1)[:k]
+        idx = idx[np.argsort(d2[idx], kind="stable")]
+        return idx, np.sqrt(d2[idx])
@@ -0,0 +1,90 @@
+"""
+Fronteira de Pareto (skyline) do catálogo.
+
+Todos os objetivos são convertidos para minimização (torque e velocidade
+trocam de sinal). Valores ausentes contam como o pior possível, então um
+servo sem preço nunca domina ninguém no objetivo "price".
+
+- 2 objetivos: ordenação + varredura, O(n log n).
+- 3+ objetivos: divisão e conquista no estilo de Kung: ordena
+  lexicograficamente, resolve as duas metades e descarta da segunda os
+  pontos dominados pela fronteira da primeira (um ponto posterior na
+  ordem nunca domina um anterior).
+"""
+import numpy as np
+
+# nome -> (sentido, função que extrai o vetor das colunas do catálogo)
+OBJECTIVES = {
+    "torque": ("max", lambda cols: cols["torque"]),
+    "speed": ("max", lambda cols: cols["speed"]),
+    "weight": ("min", lambda cols: cols["weight"]),
+    "volume": ("min", lambda cols: np.asarray(cols["length"]) * cols["width"] * cols["height"]),
+    "price": ("min", lambda cols: cols["price"]),
+}
+
+BASE_CASE = 32
+
+def objective_matrix(columns, indices, objectives):
+    """Matriz (len(indices), len(objectives)) já em forma de minimização."""
+    cols = []
+    for name in objectives:
+        sense, getter = OBJECTIVES[name]
+        values = np.asarray(getter(columns), dtype=float)[indices]
+        if sense == "max":
+            values = -values
+        cols.append(np.where(np.isnan(values), np.inf, values))
+    return np.column_stack(cols) if cols else np.empty((len(indices), 0))
+
+def pareto_mask(points):
+    """Máscara dos pontos não dominados (minimização em todas as colunas)."""
+    points = np.asarray(points, dtype=float)
+    n, d = points.shape
+    if n == 0 or d == 0:
+        return np.ones(n, dtype=bool)
+    if d == 1:
+        return points[:, 0] == points[:, 0].min()
+
+    # Pontos repetidos não se dominam: resolve sobre os únicos e replica
+    unique, inverse = np.unique(points, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    # np.unique já devolve em ordem lexicográfica (1ª coluna, depois 2ª...)
+    if d == 2:
+        front = _front_2d(unique)
+    else:
+        front = np.zeros(len(unique), dtype=bool)
+        front[_front_dc(unique, np.arange(len(unique)))] = True
+    return front[inverse]
+
+def _front_2d(sorted_pts):
+    """Varredura: um ponto está na fronteira se o y é menor que todos os anteriores."""
+    y = sorted_pts[:, 1]
+    prev_min = np.concatenate(([np.inf], np.minimum.accumulate(y)[:-1]))
+    return y < prev_min
+
+def _front_dc(pts, idx):
+    """Índices (em `idx`, ordem lexicográfica) da fronteira de pts[idx]."""
+    if len(idx) <= BASE_CASE:
+        return _front_brute(pts, idx)
+    mid = len(idx) // 2
+    top = _front_dc(pts, idx[:mid])
+    bottom = _front_dc(pts, idx[mid:])
+    # Pontos da 2ª metade dominados por algum da fronteira da 1ª saem
+    a = pts[top][:, None, :]
+    b = pts[bottom][None, :, :]
+    dominated = ((a <= b).all(axis=2) & (a < b).any(axis=2)).any(axis=0)
+    return np.concatenate([top, bottom[~dominated]])
+
+def _front_brute(pts, idx):
+    p = pts[idx]
+    le = (p[:, None, :] <= p[None, :, :]).all(axis=2)
+    lt = (p[:, None, :] < p[None, :, :]).any(axis=2)
+    dominated = (le & lt).any(axis=0)
+    return idx[~dominated]
+
+def pareto_front(columns, indices, objectives):
+    """Subconjunto de `indices` que é não dominado nos `objectives` escolhidos
+    (columns = ServoCatalog.columns ou ServoCatalog.columns_at(...)[0])."""
+    indices = np.asarray(indices, dtype=int)
+    if len(indices) == 0 or not objectives:
+        return indices
+    return indices[pareto_mask(objective_matrix(columns, indices, objectives))]
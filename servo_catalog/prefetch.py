@@ -0,0 +1,332 @@
+"""
+Cache de imagens ausentes e pré-busca em lote das imagens dos servos.
+
+Database/Images/.missing.json guarda os modelos para os quais a busca já
+falhou, com um "retry_after": até lá o app não tenta baixar de novo. A
+espera dobra a cada falha (MISSING_RETRY_BASE ... MISSING_RETRY_MAX).
+
+A pré-busca percorre o catálogo e baixa o que falta, com um limite global
+de downloads simultâneos (--workers) e um limite de requisições por host
+(--rate, por segundo):
+    python -m servo_catalog.prefetch [--workers N] [--rate R] [--limit N]
+
+Por padrão a fonte é o Google Imagens (icrawler). Com --url-template a
+imagem vem de uma URL montada a partir do modelo, o que permite testar
+contra um servidor local, por exemplo:
+    python -m http.server 8000 -d /tmp/imagens_fake
+    python -m servo_catalog.prefetch --url-template "http://127.0.0.1:8000/{model}.jpg"
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from .catalog import load_catalog
+from .manifest import MediaManifest, safe_model_name
+from .thumbnails import IMAGES_DIR, IMAGE_EXTENSIONS, first_image
+
+MISSING_PATH = os.path.join(IMAGES_DIR, ".missing.json")
+MISSING_RETRY_BASE = 24 * 3600      # 1 dia depois da primeira falha
+MISSING_RETRY_MAX = 30 * 24 * 3600  # nunca espera mais de 30 dias
+MISSING_RELOAD_SECONDS = 5.0        # consultas conferem o arquivo no máx. a cada N s
+
+GOOGLE_HOST = "www.google.com"
+DOWNLOAD_TIMEOUT = 15
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+USER_AGENT = "Mozilla/5.0 (Servo catalog image prefetch)"
+
+###############################################################################
+#                           CACHE DE IMAGENS AUSENTES                         #
+###############################################################################
+class MissingCache:
+    """
+    Modelos sem imagem -> {"failures": n, "retry_after": epoch}. Cada
+    alteração regrava o arquivo de forma atômica (tmp + os.replace).
+
+    O launcher e o `prefetch` usam o mesmo arquivo ao mesmo tempo: cada
+    alteração relê o arquivo e aplica só a própria mudança antes de gravar
+    (não devolve entradas que o outro processo apagou), e as consultas
+    relêem o arquivo quando o mtime dele muda (conferido no máximo a cada
+    MISSING_RELOAD_SECONDS, para não tocar no disco a cada card).
+    """
+
+    def __init__(self, path=MISSING_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.loaded_mtime = None
+        self.checked_at = None
+        self.entries = {}
+        self._reload_if_changed()
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if self.checked_at is not None and now - self.checked_at < MISSING_RELOAD_SECONDS:
+            return
+        self.checked_at = now
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self.loaded_mtime:
+            self.entries = self._read() if mtime is not None else {}
+            self.loaded_mtime = mtime
+
+    def __contains__(self, model_name):
+        """Se o modelo está no cache (só memória, sem reler o arquivo)."""
+        return safe_model_name(model_name) in self.entries
+
+    def should_try(self, model_name, now=None):
+        self._reload_if_changed()
+        entry = self.entries.get(safe_model_name(model_name))
+        if entry is None:
+            return True
+        return (now if now is not None else time.time()) >= entry["retry_after"]
+
+    def mark_missing(self, model_name, now=None):
+        now = now if now is not None else time.time()
+        key = safe_model_name(model_name)
+        with self.lock:
+            entries = self._read()
+            failures = entries.get(key, {}).get("failures", 0) + 1
+            wait = min(MISSING_RETRY_BASE * 2 ** (failures - 1), MISSING_RETRY_MAX)
+            entries[key] = {"failures": failures, "retry_after": now + wait}
+            self._save(entries)
+
+    def clear(self, model_name):
+        key = safe_model_name(model_name)
+        with self.lock:
+            entries = self._read()
+            if entries.pop(key, None) is not None:
+                self._save(entries)
+            else:
+                self.entries.pop(key, None)
+
+    def _save(self, entries):
+        """Grava `entries` (já mescladas com o arquivo atual) e passa a usá-las."""
+        self.entries = entries
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+            self.loaded_mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            print(f"[AVISO] Não foi possível gravar {self.path}: {e}")
+
+###############################################################################
+#                               LIMITE POR HOST                               #
+###############################################################################
+class HostRateLimiter:
+    """No máximo `rate` requisições por segundo para cada host."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def wait(self, host):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+###############################################################################
+#                                   FONTES                                    #
+###############################################################################
+class ImageNotFound(Exception):
+    """A fonte respondeu, mas não há imagem para o modelo (vai para o cache de ausentes)."""
+
+def download_image(url, folder, limiter=None, timeout=DOWNLOAD_TIMEOUT):
+    """Baixa `url` para `folder`/000001.<ext>. Retorna o caminho gravado."""
+    # urllib.request puxa http/ssl/email: só quando há download (o launcher importa este módulo)
+    import mimetypes
+    import urllib.error
+    import urllib.request
+
+    if limiter is not None:
+        limiter.wait(urllib.parse.urlsplit(url).netloc)
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            content_type = resp.headers.get_content_type()
+            data = resp.read(MAX_IMAGE_BYTES + 1)
+    except urllib.error.HTTPError as e:
+        if e.code in (404, 410):
+            raise ImageNotFound(f"HTTP {e.code}") from e
+        raise
+
+    ext = mimetypes.guess_extension(content_type) or ""
+    if ext in (".jpe", ".jpeg"):
+        ext = ".jpg"
+    if not content_type.startswith("image/") or ext not in IMAGE_EXTENSIONS:
+        raise ImageNotFound(f"resposta não é imagem ({content_type})")
+    if len(data) > MAX_IMAGE_BYTES:
+        raise ImageNotFound("imagem maior que o limite")
+
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, "000001" + ext)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return path
+
+def url_template_source(template):
+    """Fonte que baixa de `template`.format(model=..., make=...)."""
+    def fetch(model_name, make, folder, limiter):
+        url = template.format(
+            model=urllib.parse.quote(safe_model_name(model_name)),
+            make=urllib.parse.quote(make or ""),
+        )
+        return download_image(url, folder, limiter)
+    return fetch
+
+def google_image_search(model_name, folder, threads=1):
+    """
+    Baixa em `folder` a primeira imagem do Google para "<modelo> servo".
+    Retorna o caminho, ou None se a página de resultados veio sem imagem.
+
+    O icrawler só registra no log as falhas de rede e retorna normalmente;
+    se nenhuma página de resultados chegou (offline, bloqueio), a busca não
+    aconteceu e sai ConnectionError, para não entrar no cache de ausentes.
+    """
+    from icrawler.builtin import GoogleImageCrawler
+    from icrawler.builtin.google import GoogleParser
+
+    pages = []
+
+    class CheckedParser(GoogleParser):
+        def parse(self, response, **kwargs):
+            pages.append(response.status_code)
+            if not response.ok:
+                return []
+            return super().parse(response, **kwargs) or []
+
+    crawler = GoogleImageCrawler(
+        parser_cls=CheckedParser,
+        parser_threads=threads,
+        downloader_threads=threads,
+        storage={'root_dir': folder}
+    )
+    crawler.crawl(keyword=f"{model_name} servo", max_num=1)
+    path = first_image(folder)
+    if path is None and not any(200 <= code < 300 for code in pages):
+        raise ConnectionError(f"busca no Google sem resposta (HTTP {pages or 'nenhum'})")
+    return path
+
+def google_source(model_name, make, folder, limiter):
+    """Mesma busca do app: primeira imagem do Google para "<modelo> servo"."""
+    limiter.wait(GOOGLE_HOST)
+    os.makedirs(folder, exist_ok=True)
+    path = google_image_search(model_name, folder)
+    if path is None:
+        raise ImageNotFound("nenhuma imagem encontrada")
+    return path
+
+###############################################################################
+#                                 PRÉ-BUSCA                                   #
+###############################################################################
+def models_without_image(records, manifest, missing, retry_missing=False, now=None):
+    """(modelo, fabricante) do catálogo sem imagem local, um por pasta."""
+    pending, seen = [], set()
+    for row in records:
+        model = row.get("Model")
+        if not model:
+            continue
+        key = safe_model_name(model)
+        if key in seen:
+            continue
+        seen.add(key)
+        if manifest.image_for(model):
+            continue
+        if not retry_missing and not missing.should_try(model, now):
+            continue
+        pending.append((model, row.get("Make")))
+    return pending
+
+def prefetch(models, source, images_dir=IMAGES_DIR, missing=None, workers=4, rate=1.0, progress=None):
+    """
+    Busca as imagens de `models` ([(modelo, fabricante)]) com no máximo
+    `workers` downloads simultâneos e `rate` req/s por host.
+    Retorna {"fetched", "missing", "errors"}.
+    """
+    limiter = HostRateLimiter(rate)
+    stats = {"fetched": 0, "missing": 0, "errors": 0}
+    stats_lock = threading.Lock()
+
+    def run_one(item):
+        model, make = item
+        folder = os.path.join(images_dir, safe_model_name(model))
+        try:
+            source(model, make, folder, limiter)
+            outcome = "fetched"
+            if missing is not None:
+                missing.clear(model)
+        except ImageNotFound:
+            outcome = "missing"
+            if missing is not None:
+                missing.mark_missing(model)
+        except Exception as e:  # rede/timeout: não entra no cache, tenta na próxima
+            outcome = "errors"
+            print(f"[AVISO] {model}: {e}")
+        with stats_lock:
+            stats[outcome] += 1
+            if progress is not None:
+                progress(model, outcome, stats)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(run_one, models))
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Baixa as imagens que faltam em Database/Images.")
+    parser.add_argument("--json", help="catálogo (padrão: Database/servos.db se existir, senão servos.json)")
+    parser.add_argument("--workers", type=int, default=4, help="downloads simultâneos (padrão: 4)")
+    parser.add_argument("--rate", type=float, default=1.0, help="requisições por segundo por host (padrão: 1)")
+    parser.add_argument("--url-template", help="baixa de uma URL, ex.: http://127.0.0.1:8000/{model}.jpg")
+    parser.add_argument("--limit", type=int, default=None, help="no máximo N modelos")
+    parser.add_argument("--retry-missing", action="store_true", help="ignora o retry_after do cache de ausentes")
+    parser.add_argument("--dry-run", action="store_true", help="só lista o que seria buscado")
+    args = parser.parse_args(argv)
+
+    missing = MissingCache()
+    pending = models_without_image(
+        load_catalog(args.json).records, MediaManifest(), missing, retry_missing=args.retry_missing
+    )
+    if args.limit is not None:
+        pending = pending[:args.limit]
+    if args.dry_run:
+        for model, make in pending:
+            print(f"{make or '?'}\t{model}")
+        print(f"{len(pending)} modelos sem imagem.")
+        return 0
+
+    source = url_template_source(args.url_template) if args.url_template else google_source
+    total = len(pending)
+
+    def progress(model, outcome, stats):
+        done = stats["fetched"] + stats["missing"] + stats["errors"]
+        print(f"[{done}/{total}] {outcome:8} {model}")
+
+    stats = prefetch(pending, source, missing=missing, workers=args.workers, rate=args.rate, progress=progress)
+    print("Imagens: {fetched} baixadas, {missing} sem imagem, {errors} com erro.".format(**stats))
+    return 1 if stats["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""
+API de consulta do catálogo sem interface gráfica (só NumPy).
+
+    from servo_catalog import select
+    sel = select(torque_min=10, weight_max=60, bus_voltage=7.4, sort="-torque", top=10)
+    for row in sel.rows():
+        print(row["Make"], row["Model"], row["torque"])
+    sel.to_csv("escolhidos.csv")
+
+A ordem das etapas é a mesma da tela "Consulta Database": filtros ->
+busca textual -> fronteira de Pareto -> ordenação ou ranking/top-k. Com bus_voltage,
+torque e velocidade (filtros, ordenação e saída) são os valores estimados
+nessa tensão.
+"""
+import sys
+import csv
+import json
+import argparse
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .catalog import COLUMNS, FILTERS, load_catalog
+from .ranking import RANK_OBJECTIVES, rank, top_k
+from .search import normalize
+
+# Colunas de saída de Selection.rows(), além de Make/Model
+ROW_COLUMNS = ("torque", "speed", "weight", "length", "width", "height", "price")
+QUERY_CACHE_SIZE = 32  # consultas lembradas por QueryCache
+
+###############################################################################
+#                                  SELEÇÃO                                    #
+###############################################################################
+class Selection:
+    """
+    Resultado de select(): índices no catálogo, na ordem final. `counts`
+    guarda quantos servos sobraram após cada etapa ("filter", "search"...).
+    """
+
+    def __init__(self, catalog, indices, bus_voltage=None, counts=None, scores=None):
+        self.catalog = catalog
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.bus_voltage = bus_voltage
+        self.counts = counts or {}
+        self.scores = scores  # pontuação do ranking, alinhada com indices (ou None)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __iter__(self):
+        return iter(self.rows())
+
+    def records(self):
+        """Registros completos (esquema v2) dos servos selecionados."""
+        return [self.catalog.record(i) for i in self.indices]
+
+    def rows(self, columns=ROW_COLUMNS):
+        """Linhas planas: Make, Model e as colunas numéricas (None = ausente)."""
+        values, _ = self.catalog.columns_at(self.bus_voltage)
+        picked = {name: np.asarray(values[name])[self.indices] for name in columns}
+        out = []
+        for k, i in enumerate(self.indices):
+            record = self.catalog.record(i)
+            row = {"index": int(i), "Make": record.get("Make"), "Model": record.get("Model")}
+            for name in columns:
+                v = picked[name][k]
+                row[name] = None if np.isnan(v) else float(v)
+            if self.scores is not None:
+                row["score"] = float(self.scores[k])
+            out.append(row)
+        return out
+
+    def to_csv(self, file, columns=ROW_COLUMNS):
+        """Grava rows() em CSV (`file` = caminho ou arquivo aberto)."""
+        rows = self.rows(columns)
+        fields = ["index", "Make", "Model", *columns]
+        if self.scores is not None:
+            fields.append("score")
+
+        def write(f):
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+
+        if hasattr(file, "write"):
+            write(file)
+        else:
+            with open(file, "w", encoding="utf-8", newline="") as f:
+                write(f)
+
+    def to_json(self, file, full=False):
+        """Grava rows() (ou os registros completos, full=True) em JSON."""
+        data = {
+            "bus_voltage": self.bus_voltage,
+            "servos": self.records() if full else self.rows(),
+        }
+        if hasattr(file, "write"):
+            json.dump(data, file, indent=2, ensure_ascii=False)
+        else:
+            with open(file, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
+###############################################################################
+#                             CACHE DE CONSULTAS                              #
+###############################################################################
+def query_key(bus_voltage=None, search=None, pareto=None, sort=None, weights=None, top=None, **filters):
+    """
+    Tupla canônica dos parâmetros de select(): filtros desligados (None) e
+    pesos zero somem, a ordem dos objetivos de Pareto não importa e a busca
+    é comparada normalizada ("SAVOX " == "savox").
+    """
+    def number(v):
+        return None if v is None else float(v)
+
+    return (
+        tuple(sorted((arg, float(v)) for arg, v in filters.items() if v is not None)),
+        number(bus_voltage),
+        normalize(search) if search else "",
+        tuple(sorted(pareto)) if pareto is not None else None,
+        sort or None,
+        tuple(sorted((name, float(w)) for name, w in weights.items() if w)) if weights else None,
+        top,
+    )
+
+class QueryCache:
+    """
+    LRU das últimas `maxsize` consultas: (catalog.source_key, query_key) ->
+    Selection (índices na ordem final, pontuações e contagens). Como a chave
+    tem o mtime/tamanho do arquivo, editar o catálogo invalida tudo sozinho.
+    Pode ser usado de várias threads.
+    """
+
+    def __init__(self, maxsize=QUERY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            selection = self.entries.get(key)
+            if selection is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return selection
+
+    def put(self, key, selection):
+        with self.lock:
+            self.entries[key] = selection
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+###############################################################################
+#                                  CONSULTA                                   #
+###############################################################################
+def parse_sort(sort):
+    """"-torque" -> ("torque", True); "weight" -> ("weight", False)."""
+    descending = sort.startswith("-")
+    name = sort.lstrip("+-")
+    if name not in COLUMNS:
+        raise ValueError(f"Coluna de ordenação desconhecida: {name!r} (use {', '.join(COLUMNS)})")
+    return name, descending
+
+def parse_weights(text):
+    """"torque_margin=2,weight=1" -> {"torque_margin": 2.0, "weight": 1.0}."""
+    weights = {}
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition("=")
+        weights[name.strip()] = float(value) if value.strip() else 1.0
+    return weights
+
+def select(catalog=None, bus_voltage=None, search=None, pareto=None, sort=None, weights=None,
+           top=None, checkpoint=None, cache=None, **filters):
+    """
+    Seleciona servos do catálogo (padrão: load_catalog()).
+
+    filters: argumentos de FILTERS (torque_min, weight_max, ...; None = desligado)
+    search: texto para a busca por Make/Model (resultado em ordem de relevância)
+    pareto: objetivos de pareto.OBJECTIVES (ex.: ("torque", "weight"))
+    sort: coluna de COLUMNS, "-" na frente para decrescente
+    weights: pesos do ranking ({objetivo de ranking.RANK_OBJECTIVES: peso});
+             ordena pela pontuação, com torque exigido = torque_min
+    top: só os `top` primeiros (com sort/weights, os melhores)
+    checkpoint: função chamada entre as etapas (pode lançar exceção para cancelar)
+    cache: QueryCache; uma consulta repetida (mesmo catálogo, mesma
+           query_key) devolve a Selection guardada sem refazer nada
+    """
+    unknown = set(filters) - set(FILTERS)
+    if unknown:
+        raise TypeError(f"Filtros desconhecidos: {', '.join(sorted(unknown))}")
+    if sort and weights:
+        raise ValueError("Use sort ou weights, não os dois.")
+    catalog = catalog if catalog is not None else load_catalog()
+    checkpoint = checkpoint or (lambda: None)
+
+    key = None
+    if cache is not None and catalog.source_key is not None:
+        key = (catalog.source_key, query_key(bus_voltage, search, pareto, sort, weights, top, **filters))
+        selection = cache.get(key)
+        if selection is not None:
+            return selection
+
+    counts = {}
+    indices = catalog.filter(bus_voltage=bus_voltage, **filters)
+    counts["filter"] = len(indices)
+    checkpoint()
+    if search:
+        indices = catalog.search(search, indices=indices)
+        counts["search"] = len(indices)
+        checkpoint()
+    if pareto:
+        indices = catalog.pareto(indices, pareto, bus_voltage=bus_voltage)
+        counts["pareto"] = len(indices)
+        checkpoint()
+    scores = None
+    if sort:
+        name, descending = parse_sort(sort)
+        columns, _ = catalog.columns_at(bus_voltage)
+        indices = indices[top_k(np.asarray(columns[name])[indices], top, descending)]
+    elif weights:
+        columns, _ = catalog.columns_at(bus_voltage)
+        indices, scores = rank(columns, indices, weights, filters.get("torque_min"), k=top)
+    elif top is not None:
+        indices = indices[:top]
+    selection = Selection(catalog, indices, bus_voltage, counts, scores)
+    if key is not None:
+        cache.put(key, selection)
+    return selection
+
+###############################################################################
+#                                    CLI                                      #
+###############################################################################
+def _print_table(selection, file):
+    rows = selection.rows()
+    header = ["Make", "Model", *ROW_COLUMNS] + (["score"] if selection.scores is not None else [])
+    def cell(v):
+        if v is None:
+            return "-"
+        return f"{v:g}" if isinstance(v, float) else str(v)
+
+    cells = [[cell(r[h]) for h in header] for r in rows]
+    widths = [max([len(h)] + [len(c[j]) for c in cells]) for j, h in enumerate(header)]
+    print("  ".join(h.ljust(w) for h, w in zip(header, widths)), file=file)
+    for c in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(c, widths)), file=file)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m servo_catalog query",
+        description="Consulta o catálogo de servos sem abrir a interface.",
+    )
+    parser.add_argument("--catalog", help="servos.json ou servos.db (padrão: Database/servos.db se existir, senão servos.json)")
+    for arg in FILTERS:
+        parser.add_argument(f"--{arg.replace('_', '-')}", dest=arg, type=float, metavar="X")
+    parser.add_argument("--voltage", type=float, help="tensão de barramento (V) para torque/velocidade")
+    parser.add_argument("--search", help="texto de Make/Model")
+    parser.add_argument("--pareto", help="objetivos separados por vírgula (ex.: torque,weight)")
+    parser.add_argument("--sort", help=f"coluna de ordenação ({', '.join(COLUMNS)})")
+    parser.add_argument("--desc", action="store_true", help="ordem decrescente (ex.: maior torque primeiro)")
+    parser.add_argument("--rank", help="pesos do ranking, ex.: torque_margin=2,weight=1,price=1 "
+                                       f"(objetivos: {', '.join(RANK_OBJECTIVES)})")
+    parser.add_argument("--top", type=int, help="só os N primeiros")
+    parser.add_argument("--format", choices=("table", "csv", "json"), default="table")
+    parser.add_argument("--full", action="store_true", help="JSON com os registros completos")
+    parser.add_argument("-o", "--output", help="arquivo de saída (padrão: tela)")
+    args = parser.parse_args(argv)
+
+    catalog = load_catalog(args.catalog)
+    try:
+        selection = select(
+            catalog,
+            bus_voltage=args.voltage,
+            search=args.search,
+            pareto=tuple(p.strip() for p in args.pareto.split(",") if p.strip()) if args.pareto else None,
+            sort=("-" if args.desc else "") + args.sort if args.sort else None,
+            weights=parse_weights(args.rank) if args.rank else None,
+            top=args.top,
+            **{arg: getattr(args, arg) for arg in FILTERS},
+        )
+    except (ValueError, KeyError) as e:
+        parser.error(str(e))
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            selection.to_csv(out)
+        elif args.format == "json":
+            selection.to_json(out, full=args.full)
+            out.write("\n")
+        else:
+            _print_table(selection, out)
+    finally:
+        if args.output:
+            out.close()
+    if args.output:
+        print(f"{len(selection)} servo(s) gravado(s) em {args.output}.")
+    return 0
@@ -0,0 +1,96 @@
+"""
+Ranking dos servos filtrados por pontuação ponderada.
+
+Cada objetivo é normalizado entre os candidatos (0 = pior, 1 = melhor do
+conjunto; valor ausente = 0) e a pontuação é a média ponderada pelos pesos
+do usuário. Com bus_voltage, torque e velocidade são os estimados nessa
+tensão.
+
+- torque_margin: folga de torque sobre o exigido (torque_min), em escala
+  log (log1p da folga relativa): passar de 10% para 50% de folga vale mais
+  que de 300% para 340%. Sem torque exigido, usa log1p do torque.
+- speed: maior é melhor;  weight, price: menor é melhor.
+
+Os k melhores saem de top_k() (argpartition), sem ordenar o conjunto todo.
+"""
+import numpy as np
+
+# nome -> (sentido, descrição)
+RANK_OBJECTIVES = {
+    "torque_margin": ("max", "Folga de torque"),
+    "speed": ("max", "Velocidade"),
+    "weight": ("min", "Peso"),
+    "price": ("min", "Preço"),
+}
+
+###############################################################################
+#                                   TOP-K                                     #
+###############################################################################
+def top_k(values, k, descending=False):
+    """
+    Posições dos k melhores de `values` em ordem (NaN sempre por último),
+    com argpartition: O(n + k log k) em vez de ordenar tudo.
+    """
+    values = np.asarray(values, dtype=float)
+    key = -values if descending else values.copy()
+    key[np.isnan(key)] = np.inf
+    n = len(key)
+    if k is None or k >= n:
+        return np.argsort(key, kind="stable")
+    if k <= 0:
+        return np.arange(0)
+    kth = key[np.argpartition(key, k - 1)[k - 1]]
+    # Empates no k-ésimo valor: fica quem vem antes (igual à ordenação estável)
+    cand = np.flatnonzero(key <= kth)
+    return cand[np.lexsort((cand, key[cand]))][:k]
+
+###############################################################################
+#                                 PONTUAÇÃO                                   #
+###############################################################################
+def objective_values(columns, indices, name, required_torque=None):
+    """Vetor cru do objetivo `name` para os `indices` (NaN = ausente)."""
+    if name == "torque_margin":
+        torque = np.asarray(columns["torque"], dtype=float)[indices]
+        if required_torque:
+            margin = torque / required_torque - 1.0
+        else:
+            margin = torque
+        with np.errstate(invalid="ignore"):
+            return np.log1p(np.maximum(margin, 0.0))
+    return np.asarray(columns[name], dtype=float)[indices]
+
+def normalize(values, sense):
+    """Min-max entre os candidatos: 1 = melhor, 0 = pior ou ausente."""
+    out = np.zeros(len(values))
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return out
+    lo, hi = values[valid].min(), values[valid].max()
+    if hi == lo:
+        out[valid] = 1.0
+        return out
+    scaled = (values[valid] - lo) / (hi - lo)
+    out[valid] = scaled if sense == "max" else 1.0 - scaled
+    return out
+
+def scores(columns, indices, weights, required_torque=None):
+    """Pontuação (0..1) de cada servo de `indices`; weights = {objetivo: peso}."""
+    indices = np.asarray(indices, dtype=int)
+    total = np.zeros(len(indices))
+    weight_sum = 0.0
+    for name, weight in weights.items():
+        if name not in RANK_OBJECTIVES:
+            raise KeyError(f"Objetivo de ranking desconhecido: {name!r}")
+        if not weight:
+            continue
+        sense, _ = RANK_OBJECTIVES[name]
+        total += weight * normalize(objective_values(columns, indices, name, required_torque), sense)
+        weight_sum += weight
+    return total / weight_sum if weight_sum else total
+
+def rank(columns, indices, weights, required_torque=None, k=None):
+    """(indices do melhor para o pior, pontuações), só os k primeiros se k for dado."""
+    indices = np.asarray(indices, dtype=np.int64)
+    s = scores(columns, indices, weights, required_torque)
+    order = top_k(s, k, descending=True)
+    return indices[order], s[order]
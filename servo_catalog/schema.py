@@ -0,0 +1,205 @@
+"""
+Esquema tipado dos registros do catálogo (schema_version 2).
+
+Até a versão 1 o servos.json era uma cópia do CSV: tudo texto ("9.07",
+"$30.99", "" para ausente) e cinco pares TensãoTorqueN/TorqueN soltos. Na
+versão 2 cada registro já vem pronto para uso:
+
+    {
+      "Make": "Ace RC", "Model": "C0915*", "Modulation": "Analog",
+      "Weight (g)": 9.07, "L (mm)": 22.1, "C (mm)": 11.43, "A (mm)": 23.62,
+      "TensãoTorque": [4.8, 6.0], "Torque (kgf.cm)": [1.5, 1.9],
+      "TensãoSpeed": [4.8, 6.0], "Speed (°/s)": [600.0, 750.0],
+      "Motor Type": null, "Rotation": "Single Bearing", "Gear Material": "Plastic",
+      "Typical Price": 30.99, "Currency": "USD", "Link": null
+    }
+
+Números são números, ausentes são null ("" e "-" viram null) e as curvas
+são listas alinhadas (tensão[i] <-> valor[i], na ordem dos slots originais).
+normalize_record() aceita tanto o formato antigo quanto o novo, então
+registros de fontes antigas (diário, garimpo, CSV) passam pela mesma porta.
+
+Migração do arquivo existente:
+    python -m servo_catalog migrate [Database/servos.json]
+"""
+import os
+import sys
+import json
+import math
+import argparse
+
+SCHEMA_VERSION = 2
+N_SLOTS = 5  # TensãoTorque1..5 / Speed1..5 do formato antigo
+
+TEXT_FIELDS = ("Make", "Model", "Modulation", "Motor Type", "Rotation", "Gear Material", "Link")
+NUMBER_FIELDS = ("Weight (g)", "L (mm)", "C (mm)", "A (mm)")
+PRICE_FIELD = "Typical Price"
+CURRENCY_FIELD = "Currency"
+
+# Curvas: nome -> (chave das tensões, chave dos valores)
+CURVES = {
+    "torque": ("TensãoTorque", "Torque (kgf.cm)"),
+    "speed": ("TensãoSpeed", "Speed (°/s)"),
+}
+# Mesmas curvas no formato antigo (um campo por slot)
+LEGACY_CURVES = {
+    "torque": (
+        [f"TensãoTorque{i}" for i in range(1, N_SLOTS + 1)],
+        [f"Torque{i} (kgf.cm)" for i in range(1, N_SLOTS + 1)],
+    ),
+    "speed": (
+        [f"TensãoSpeed{i}" for i in range(1, N_SLOTS + 1)],
+        [f"Speed{i} (°/s)" for i in range(1, N_SLOTS + 1)],
+    ),
+}
+
+# Símbolo -> moeda (os mais longos primeiro: "R$" antes de "$")
+CURRENCY_SYMBOLS = (("US$", "USD"), ("R$", "BRL"), ("€", "EUR"), ("£", "GBP"), ("$", "USD"))
+MISSING_TEXT = ("", "-", "n/a", "na", "none", "null")
+
+###############################################################################
+#                               CONVERSÃO DE VALORES                          #
+###############################################################################
+def parse_text(value):
+    if value is None:
+        return None
+    text = str(value).strip()
+    return None if text.lower() in MISSING_TEXT else text
+
+def parse_number(value):
+    """Número ou None; aceita "1,520.00", "$30.99" e números já convertidos."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return None if math.isnan(value) else float(value)
+    text = parse_text(value)
+    if text is None:
+        return None
+    for symbol, _ in CURRENCY_SYMBOLS:
+        text = text.replace(symbol, "")
+    try:
+        number = float(text.replace(",", "").strip())
+    except ValueError:
+        return None
+    return None if math.isnan(number) else number
+
+def parse_price(value):
+    """(valor, moeda) de um preço como "$30.99"; (None, None) se ausente."""
+    number = parse_number(value)
+    if number is None:
+        return None, None
+    currency = "USD"
+    if isinstance(value, str):
+        for symbol, code in CURRENCY_SYMBOLS:
+            if symbol in value:
+                currency = code
+                break
+    return number, currency
+
+###############################################################################
+#                                   REGISTROS                                 #
+###############################################################################
+def is_typed(record):
+    return any(values_key in record for _, values_key in CURVES.values())
+
+def _legacy_curve(record, volts_keys, values_keys):
+    volts, values = [], []
+    for volt_key, value_key in zip(volts_keys, values_keys):
+        v, y = parse_number(record.get(volt_key)), parse_number(record.get(value_key))
+        if v is not None or y is not None:
+            volts.append(v)
+            values.append(y)
+    return volts, values
+
+def _typed_curve(record, volts_key, values_key):
+    volts = [parse_number(v) for v in record.get(volts_key) or []]
+    values = [parse_number(y) for y in record.get(values_key) or []]
+    n = max(len(volts), len(values))
+    volts += [None] * (n - len(volts))
+    values += [None] * (n - len(values))
+    pairs = [(v, y) for v, y in zip(volts, values) if v is not None or y is not None]
+    return [v for v, _ in pairs], [y for _, y in pairs]
+
+def normalize_record(record):
+    """Registro no esquema v2 a partir de um registro antigo (texto) ou já tipado."""
+    typed = is_typed(record)
+    out = {field: parse_text(record.get(field)) for field in ("Make", "Model", "Modulation")}
+    for field in NUMBER_FIELDS:
+        out[field] = parse_number(record.get(field))
+    for name, (volts_key, values_key) in CURVES.items():
+        if typed:
+            volts, values = _typed_curve(record, volts_key, values_key)
+        else:
+            volts, values = _legacy_curve(record, *LEGACY_CURVES[name])
+        out[volts_key] = volts
+        out[values_key] = values
+    for field in ("Motor Type", "Rotation", "Gear Material"):
+        out[field] = parse_text(record.get(field))
+    price, currency = parse_price(record.get(PRICE_FIELD))
+    out[PRICE_FIELD] = price
+    out[CURRENCY_FIELD] = (parse_text(record.get(CURRENCY_FIELD)) or currency) if price is not None else None
+    out["Link"] = parse_text(record.get("Link"))
+
+    # Campos extras (ex.: vindos do garimpo) são preservados como estão
+    known = set(out) | {k for keys in LEGACY_CURVES.values() for group in keys for k in group}
+    for key, value in record.items():
+        if key not in known:
+            out[key] = value
+    return out
+
+def as_typed(record):
+    """O próprio registro se já estiver no esquema v2; senão, a versão normalizada."""
+    return record if is_typed(record) else normalize_record(record)
+
+def curve(record, name):
+    """(tensões, valores) da curva `name` ("torque"/"speed") de um registro v2."""
+    volts_key, values_key = CURVES[name]
+    return record.get(volts_key) or [], record.get(values_key) or []
+
+###############################################################################
+#                                   ARQUIVO                                   #
+###############################################################################
+def make_document(records):
+    return {"schema_version": SCHEMA_VERSION, "servos": [normalize_record(r) for r in records]}
+
+def write_document(json_path, data):
+    """Grava o JSON de forma atômica (tmp + os.replace)."""
+    tmp = f"{json_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, json_path)
+
+def migrate_file(json_path):
+    """Converte o servos.json para o esquema atual. Retorna (versão antiga, nº de registros)."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    old_version = data.get("schema_version", 1)
+    if old_version == SCHEMA_VERSION:
+        return old_version, len(data.get("servos", []))
+    new = make_document(data.get("servos", []))
+    # Demais chaves do topo (ex.: "journal_applied") continuam valendo
+    for key, value in data.items():
+        new.setdefault(key, value)
+    write_document(json_path, new)
+    return old_version, len(new["servos"])
+
+def main(argv=None):
+    from .catalog import DEFAULT_JSON_PATH
+
+    parser = argparse.ArgumentParser(description="Esquema tipado do catálogo de servos.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_migrate = sub.add_parser("migrate", help="converte o servos.json para o esquema atual")
+    p_migrate.add_argument("json_path", nargs="?", default=DEFAULT_JSON_PATH)
+    args = parser.parse_args(argv)
+
+    old_version, count = migrate_file(args.json_path)
+    if old_version == SCHEMA_VERSION:
+        print(f"{args.json_path} já está no esquema {SCHEMA_VERSION} ({count} servos).")
+    else:
+        print(f"{args.json_path}: esquema {old_version} -> {SCHEMA_VERSION} ({count} servos).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Busca textual por Make/Model/Link com índice invertido de trigramas.
+
+Os textos são normalizados (minúsculas, sem acentos, só letras e números), então
+"hs645", "HS 645" e "HS-645MG" casam com "HS-645MG". Cada campo entra no
+índice como " campo " (com bordas), e a consulta não leva a borda final,
+o que faz a digitação incremental funcionar como busca por prefixo.
+
+Pontuação = fração dos trigramas da consulta presentes no servo; acima de
+FUZZY_MIN_SCORE o servo entra no resultado (erros de digitação ainda
+encontram o modelo). Consultas com menos de 3 caracteres usam bisect numa
+lista ordenada dos nomes normalizados.
+"""
+import re
+import bisect
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+
+SEARCH_FIELDS = ("Make", "Model", "Link")
+FUZZY_MIN_SCORE = 0.5
+
+_non_alnum = re.compile(r"[^0-9a-z]+")
+
+def normalize(text):
+    """Minúsculas, sem acentos ("Savöx" -> "savox") e só letras/números."""
+    ascii_text = unicodedata.normalize("NFKD", str(text or "")).encode("ascii", "ignore").decode("ascii")
+    return _non_alnum.sub("", ascii_text.lower())
+
+def trigrams(text, closed=True):
+    padded = f" {text} " if closed else f" {text}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TextIndex:
+    def __init__(self, records, fields=SEARCH_FIELDS):
+        self.n = len(records)
+        self.texts = []
+        postings = defaultdict(list)
+        names = []
+        for i, row in enumerate(records):
+            make, model = normalize(row.get("Make")), normalize(row.get("Model"))
+            # "make+model" junto permite buscar "savox sc1256" de uma vez
+            values = [normalize(row.get(field)) for field in fields] + [make + model]
+            values = [v for v in dict.fromkeys(values) if v]
+            self.texts.append(" ".join(values))
+            grams = set()
+            for v in values:
+                grams |= trigrams(v)
+            for g in grams:
+                postings[g].append(i)
+            # Nomes para a busca por prefixo curta
+            for name in {make, model, make + model}:
+                if name:
+                    names.append((name, i))
+
+        self.postings = {g: np.array(rows, dtype=np.int32) for g, rows in postings.items()}
+        names.sort()
+        self.names = [name for name, _ in names]
+        self.name_rows = np.array([i for _, i in names], dtype=np.int64)
+
+    def search(self, query, limit=None):
+        """Índices dos servos que casam com `query`, do mais para o menos relevante."""
+        q = normalize(query)
+        if not q:
+            return np.arange(self.n)
+        if len(q) < 3:
+            result = self._prefix(q)
+        else:
+            result = self._fuzzy(q)
+        return result if limit is None else result[:limit]
+
+    def _prefix(self, q):
+        start = bisect.bisect_left(self.names, q)
+        end = bisect.bisect_left(self.names, q + "\x7f")
+        return np.unique(self.name_rows[start:end])
+
+    def _fuzzy(self, q):
+        grams = trigrams(q, closed=False)
+        lists = [self.postings[g] for g in grams if g in self.postings]
+        if not lists:
+            return np.array([], dtype=np.int64)
+        hits = np.bincount(np.concatenate(lists), minlength=self.n)
+        score = hits / len(grams)
+        rows = np.flatnonzero(score >= FUZZY_MIN_SCORE)
+
+        # Substring exata vale mais que qualquer casamento aproximado
+        exact = np.array([q in self.texts[i] for i in rows], dtype=bool)
+        rank = score[rows] + exact
+        order = np.lexsort((rows, -rank))
+        return rows[order]
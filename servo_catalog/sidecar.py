@@ -0,0 +1,161 @@
+"""
+Cache binário ("sidecar") do servos.json.
+
+Ao lado do JSON fica uma pasta `.<nome>_cache/` com um .npy por coluna
+numérica, mais os registros brutos serializados num único blob UTF-8 e uma
+tabela de offsets. Tudo é aberto com mmap, então o carregamento a frio não
+faz parse de JSON nem conversão texto->float.
+
+A validade é conferida por mtime/tamanho do JSON; se eles mudarem mas o
+conteúdo (sha1) for o mesmo, só os metadados são atualizados.
+"""
+import os
+import json
+import hashlib
+
+import numpy as np
+
+SIDECAR_VERSION = 1
+META_FILE = "meta.json"
+
+###############################################################################
+#                          REGISTROS BRUTOS (LAZY)                            #
+###############################################################################
+class RecordBlob:
+    """Sequência de dicts decodificados sob demanda a partir do blob + offsets."""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return json.loads(self.blob[start:end].tobytes().decode("utf-8"))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+def encode_records(records):
+    """Serializa os registros em (blob uint8, offsets int64 com n+1 posições)."""
+    chunks = [json.dumps(r, ensure_ascii=False, separators=(",", ":")).encode("utf-8") for r in records]
+    offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+    if chunks:
+        np.cumsum([len(c) for c in chunks], out=offsets[1:])
+    blob = np.frombuffer(b"".join(chunks), dtype=np.uint8)
+    return blob, offsets
+
+###############################################################################
+#                               CAMINHOS / HASH                               #
+###############################################################################
+def sidecar_dir(json_path):
+    folder, name = os.path.split(os.path.abspath(json_path))
+    stem = os.path.splitext(name)[0]
+    return os.path.join(folder, f".{stem}_cache")
+
+def file_sha1(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def read_source(json_path):
+    """
+    (bytes, os.stat_result, sha1) do JSON, todos do mesmo arquivo aberto: se
+    ele for substituído (os.replace) no meio, continuam batendo com os bytes.
+    """
+    with open(json_path, "rb") as f:
+        st = os.fstat(f.fileno())
+        raw = f.read()
+    return raw, st, hashlib.sha1(raw).hexdigest()
+
+def _read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != SIDECAR_VERSION:
+        return None
+    return meta
+
+def _write_meta(cache_dir, meta):
+    path = os.path.join(cache_dir, META_FILE)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, path)
+
+###############################################################################
+#                             LEITURA / ESCRITA                               #
+###############################################################################
+def write_sidecar(json_path, arrays, records, stat, sha1):
+    """
+    Grava as colunas (dict nome -> ndarray) e os registros brutos.
+    `stat` e `sha1` são os dos bytes de onde vieram arrays/records
+    (read_source), não os do arquivo atual, que pode já ser outro.
+    O meta.json é escrito por último e funciona como marcador de "cache
+    completo": um processo interrompido no meio deixa o cache inválido,
+    nunca corrompido.
+    """
+    cache_dir = sidecar_dir(json_path)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    meta_path = os.path.join(cache_dir, META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    blob, offsets = encode_records(records)
+    to_save = dict(arrays)
+    to_save["_records_blob"] = blob
+    to_save["_records_offsets"] = offsets
+    for name, arr in to_save.items():
+        path = os.path.join(cache_dir, f"{name}.npy")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(arr))
+        os.replace(tmp, path)
+
+    _write_meta(cache_dir, {
+        "version": SIDECAR_VERSION,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_size": stat.st_size,
+        "source_sha1": sha1,
+        "arrays": sorted(arrays),
+    })
+
+def read_sidecar(json_path, stat=None):
+    """
+    Abre o sidecar com mmap se ele corresponder ao JSON atual.
+    Retorna (arrays, RecordBlob) ou None se for preciso reconstruir.
+    """
+    cache_dir = sidecar_dir(json_path)
+    meta = _read_meta(cache_dir)
+    if meta is None:
+        return None
+
+    stat = stat or os.stat(json_path)
+    if (meta["source_mtime_ns"], meta["source_size"]) != (stat.st_mtime_ns, stat.st_size):
+        # mtime mudou (cópia, checkout...): confere o conteúdo antes de descartar
+        if meta["source_size"] != stat.st_size or meta["source_sha1"] != file_sha1(json_path):
+            return None
+        meta["source_mtime_ns"] = stat.st_mtime_ns
+        try:
+            _write_meta(cache_dir, meta)
+        except OSError:
+            pass
+
+    try:
+        arrays = {
+            name: np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r")
+            for name in meta["arrays"]
+        }
+        blob = np.load(os.path.join(cache_dir, "_records_blob.npy"), mmap_mode="r")
+        offsets = np.load(os.path.join(cache_dir, "_records_offsets.npy"), mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    return arrays, RecordBlob(blob, offsets)
@@ -0,0 +1,242 @@
+"""
+Catálogo de servos em SQLite (Database/servos.db).
+
+Cada servo é uma linha com colunas numéricas tipadas (REAL, NULL para
+ausente) e índices nos campos filtráveis, mais o registro original em JSON
+para exportar sem perda. O banco usa WAL: cadastrar um servo é um INSERT
+(custo constante, sem reescrever o catálogo) e leitores não bloqueiam o
+escritor.
+
+    python -m servo_catalog.store import [Database/servos.json | Database/servos.csv]
+    python -m servo_catalog.store export [Database/servos.json]
+
+Com o banco criado, load_catalog(DEFAULT_DB_PATH) carrega o catálogo direto
+das colunas tipadas e os filtros simples viram consultas por faixa no SQL.
+O servos.json passa a ser só exportação.
+"""
+import os
+import sys
+import csv
+import json
+import sqlite3
+import argparse
+
+import numpy as np
+
+from . import journal
+from .catalog import repo_dir, DEFAULT_DB_PATH, DEFAULT_JSON_PATH, FILTERS, SCALAR_KEYS
+from .schema import N_SLOTS, as_typed, curve, make_document, write_document
+
+DEFAULT_CSV_PATH = os.path.join(repo_dir, "Database", "servos.csv")
+DB_SCHEMA_VERSION = 1
+
+# Slots por servo (colunas SQL torque1..5, volt_torque1..5, ...)
+SLOT_NAMES = ("torque", "speed", "volt_torque", "volt_speed")
+SLOT_COLUMNS = [f"{name}{j}" for name in SLOT_NAMES for j in range(1, N_SLOTS + 1)]
+
+# torque/speed = máximo entre os slots (mesma definição das colunas do ServoCatalog)
+NUMERIC_COLUMNS = list(SCALAR_KEYS) + ["torque", "speed"] + SLOT_COLUMNS
+INDEXED_COLUMNS = sorted({name for name, _ in FILTERS.values()})
+
+###############################################################################
+#                                   SCHEMA                                    #
+###############################################################################
+def _schema():
+    numeric = ",\n    ".join(f"{name} REAL" for name in NUMERIC_COLUMNS)
+    statements = [
+        f"""CREATE TABLE IF NOT EXISTS servos (
+    id INTEGER PRIMARY KEY,
+    make TEXT,
+    model TEXT,
+    {numeric},
+    record TEXT NOT NULL
+)""",
+        "CREATE INDEX IF NOT EXISTS idx_servos_make_model ON servos (make, model)",
+    ]
+    statements += [
+        f"CREATE INDEX IF NOT EXISTS idx_servos_{name} ON servos ({name})"
+        for name in INDEXED_COLUMNS
+    ]
+    return statements
+
+def typed_row(record):
+    """Valores das colunas do banco para um registro do catálogo (esquema v2)."""
+    record = as_typed(record)
+    values = {name: record.get(key) for name, key in SCALAR_KEYS.items()}
+    for name in ("torque", "speed"):
+        volts, ys = curve(record, name)
+        volts, ys = volts[:N_SLOTS], ys[:N_SLOTS]
+        for j in range(1, N_SLOTS + 1):
+            values[f"{name}{j}"] = ys[j - 1] if j <= len(ys) else None
+            values[f"volt_{name}{j}"] = volts[j - 1] if j <= len(volts) else None
+        present = [y for y in ys if y is not None]
+        values[name] = max(present) if present else None
+    return (
+        record.get("Make"),
+        record.get("Model"),
+        *[values[name] for name in NUMERIC_COLUMNS],
+        json.dumps(record, ensure_ascii=False),
+    )
+
+###############################################################################
+#                                    BANCO                                    #
+###############################################################################
+class CatalogStore:
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+            with self.conn:
+                for statement in _schema():
+                    self.conn.execute(statement)
+                self.conn.execute(f"PRAGMA user_version={DB_SCHEMA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM servos").fetchone()[0]
+
+    # ------------------------------- #
+    #  Escrita
+    # ------------------------------- #
+    def _insert_sql(self):
+        names = ["make", "model"] + NUMERIC_COLUMNS + ["record"]
+        return f"INSERT INTO servos ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+
+    def insert(self, record):
+        """Adiciona um servo (uma transação). Retorna o id."""
+        with self.conn:
+            return self.conn.execute(self._insert_sql(), typed_row(record)).lastrowid
+
+    def insert_many(self, records, replace=False):
+        """Adiciona vários servos numa transação; replace=True apaga o conteúdo antes."""
+        with self.conn:
+            if replace:
+                self.conn.execute("DELETE FROM servos")
+            self.conn.executemany(self._insert_sql(), (typed_row(r) for r in records))
+
+    def upsert(self, updates, inserts):
+        """Numa transação: regrava os servos de `updates` [(id, registro)] e adiciona `inserts`."""
+        names = ["make", "model"] + NUMERIC_COLUMNS + ["record"]
+        update_sql = f"UPDATE servos SET {', '.join(f'{name} = ?' for name in names)} WHERE id = ?"
+        with self.conn:
+            self.conn.executemany(update_sql, ((*typed_row(r), int(i)) for i, r in updates))
+            self.conn.executemany(self._insert_sql(), (typed_row(r) for r in inserts))
+
+    # ------------------------------- #
+    #  Leitura
+    # ------------------------------- #
+    def records(self):
+        return [json.loads(r) for (r,) in self.conn.execute("SELECT record FROM servos ORDER BY id")]
+
+    def records_with_ids(self):
+        """(ids, registros), em ordem de id."""
+        rows = self.conn.execute("SELECT id, record FROM servos ORDER BY id").fetchall()
+        return [i for i, _ in rows], [json.loads(r) for _, r in rows]
+
+    def load_arrays(self):
+        """
+        (arrays no formato de ServoCatalog.to_arrays(), registros, ids) lidos
+        direto das colunas tipadas, sem converter texto.
+        """
+        rows = self.conn.execute(
+            f"SELECT id, {', '.join(NUMERIC_COLUMNS)}, record FROM servos ORDER BY id"
+        ).fetchall()
+        n = len(rows)
+        ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=n)
+        numeric = np.array([r[1:-1] for r in rows], dtype=float).reshape(n, len(NUMERIC_COLUMNS))
+        col = {name: numeric[:, k] for k, name in enumerate(NUMERIC_COLUMNS)}
+
+        arrays = {name: np.ascontiguousarray(col[name]) for name in list(SCALAR_KEYS) + ["torque", "speed"]}
+        for name in SLOT_NAMES:
+            arrays[f"slots_{name}"] = np.column_stack(
+                [col[f"{name}{j}"] for j in range(1, N_SLOTS + 1)]
+            ) if n else np.empty((0, N_SLOTS))
+        records = [json.loads(r[-1]) for r in rows]
+        return arrays, records, ids
+
+    def filter_ids(self, max_id=None, **filters):
+        """
+        ids (crescentes) dos servos que passam nos filtros de FILTERS, como
+        consultas por faixa nos índices. Mesma semântica de
+        ServoCatalog.filter_mask: em "min" ausente conta como 0, "max" não elimina.
+        """
+        where, params = [], []
+        for arg, limit in filters.items():
+            if limit is None:
+                continue
+            name, kind = FILTERS[arg]
+            if kind == "min" and limit > 0:
+                where.append(f"{name} >= ?")
+            elif kind == "min":
+                where.append(f"({name} IS NULL OR {name} >= ?)")
+            else:
+                where.append(f"({name} IS NULL OR {name} <= ?)")
+            params.append(float(limit))
+        if max_id is not None:
+            where.append("id <= ?")
+            params.append(int(max_id))
+        sql = "SELECT id FROM servos"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id"
+        return np.array([r[0] for r in self.conn.execute(sql, params)], dtype=np.int64)
+
+    def export_json(self, json_path=DEFAULT_JSON_PATH):
+        """Grava {"schema_version", "servos"} de forma atômica (tmp + os.replace)."""
+        write_document(json_path, make_document(self.records()))
+        return json_path
+
+###############################################################################
+#                                 IMPORTAÇÃO                                  #
+###############################################################################
+def read_source(path):
+    """
+    Registros de um servos.json ({"servos": [...]}, mais o diário de
+    cadastros) ou servos.csv (com "sep=,"). Registros antigos (tudo texto)
+    são convertidos para o esquema v2 na inserção.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, "r", encoding="utf-8") as f:
+            if not f.readline().startswith("sep="):
+                f.seek(0)
+            return list(csv.DictReader(f, delimiter=","))
+    return journal.read_all(path)
+
+def import_file(src_path=DEFAULT_JSON_PATH, db_path=DEFAULT_DB_PATH):
+    """Recria o conteúdo do banco a partir de `src_path`. Retorna quantos servos."""
+    records = read_source(src_path)
+    with CatalogStore(db_path) as store:
+        store.insert_many(records, replace=True)
+        return len(store)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banco SQLite do catálogo de servos.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="banco (padrão: Database/servos.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_import = sub.add_parser("import", help="importa servos.json ou servos.csv (substitui o conteúdo)")
+    p_import.add_argument("source", nargs="?", default=DEFAULT_JSON_PATH)
+    p_export = sub.add_parser("export", help="exporta o banco para JSON")
+    p_export.add_argument("target", nargs="?", default=DEFAULT_JSON_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        count = import_file(args.source, args.db)
+        print(f"{count} servos importados de {args.source} para {args.db}.")
+    else:
+        with CatalogStore(args.db) as store:
+            store.export_json(args.target)
+            print(f"{len(store)} servos exportados para {args.target}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
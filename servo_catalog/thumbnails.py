@@ -0,0 +1,132 @@
+"""
+Cache em disco das miniaturas (80x80) das imagens de Database/Images.
+
+Cada miniatura fica em Database/Images/.thumbs/<hash>.png, onde o hash
+combina o caminho da imagem original (relativo a Database/Images), o
+tamanho e o mtime dela: trocar a imagem gera outra chave, sem precisar de
+invalidação explícita.
+
+Para preencher o cache de todas as pastas de uma vez (usa vários processos):
+    python -m servo_catalog.thumbnails [--workers N] [--prune]
+"""
+import os
+import sys
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from .catalog import repo_dir
+
+IMAGES_DIR = os.path.join(repo_dir, "Database", "Images")
+THUMBS_DIR = os.path.join(IMAGES_DIR, ".thumbs")
+THUMB_SIZE = (80, 80)
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp')
+
+###############################################################################
+#                               CHAVE / CAMINHOS                              #
+###############################################################################
+def thumb_path_for(src_path, images_dir=IMAGES_DIR, thumbs_dir=THUMBS_DIR, stat=None):
+    """Caminho da miniatura de `src_path` (existindo ou não)."""
+    stat = stat or os.stat(src_path)
+    rel = os.path.relpath(os.path.abspath(src_path), os.path.abspath(images_dir)).replace(os.sep, "/")
+    key = f"{rel}|{stat.st_size}|{stat.st_mtime_ns}|{THUMB_SIZE[0]}x{THUMB_SIZE[1]}"
+    return os.path.join(thumbs_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+def build_thumbnail(src_path, dst_path):
+    from PIL import Image
+
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    with Image.open(src_path) as img:
+        img.thumbnail(THUMB_SIZE)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+        tmp = f"{dst_path}.{os.getpid()}.tmp"
+        img.save(tmp, format="PNG")
+    os.replace(tmp, dst_path)
+    return dst_path
+
+def get_thumbnail(src_path, images_dir=IMAGES_DIR, thumbs_dir=THUMBS_DIR):
+    """
+    Caminho de uma miniatura válida de `src_path`, gerando-a se ainda não
+    existir. Se não der para gravar o cache, devolve o próprio original.
+    """
+    dst = thumb_path_for(src_path, images_dir, thumbs_dir)
+    if os.path.exists(dst):
+        return dst
+    try:
+        return build_thumbnail(src_path, dst)
+    except OSError as e:
+        print(f"[AVISO] Falha ao gerar miniatura de '{src_path}': {e}")
+        return src_path
+
+###############################################################################
+#                            PREENCHIMENTO EM LOTE                            #
+###############################################################################
+def first_image(folder):
+    """Mesma regra de main.fetch_image_for_model: primeira imagem listada."""
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return None
+    for name in names:
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            return os.path.join(folder, name)
+    return None
+
+def _build_one(args):
+    src, dst = args
+    try:
+        build_thumbnail(src, dst)
+        return src, None
+    except Exception as e:  # imagem corrompida, formato desconhecido...
+        return src, str(e)
+
+def build_all(images_dir=IMAGES_DIR, thumbs_dir=THUMBS_DIR, workers=None, prune=False):
+    """
+    Gera as miniaturas que faltam para a imagem exibida de cada pasta de
+    modelo. Retorna {"built", "cached", "failed", "pruned"}.
+    """
+    jobs, wanted, cached = [], set(), 0
+    for entry in sorted(os.scandir(images_dir), key=lambda e: e.name):
+        if not entry.is_dir() or entry.name.startswith("."):
+            continue
+        src = first_image(entry.path)
+        if src is None:
+            continue
+        dst = thumb_path_for(src, images_dir, thumbs_dir)
+        wanted.add(os.path.basename(dst))
+        if os.path.exists(dst):
+            cached += 1
+        else:
+            jobs.append((src, dst))
+
+    failed = []
+    if jobs:
+        os.makedirs(thumbs_dir, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for src, error in pool.map(_build_one, jobs, chunksize=16):
+                if error:
+                    failed.append((src, error))
+
+    pruned = 0
+    if prune and os.path.isdir(thumbs_dir):
+        for name in os.listdir(thumbs_dir):
+            if name.endswith(".png") and name not in wanted:
+                os.remove(os.path.join(thumbs_dir, name))
+                pruned += 1
+
+    for src, error in failed:
+        print(f"[AVISO] {src}: {error}")
+    return {"built": len(jobs) - len(failed), "cached": cached, "failed": len(failed), "pruned": pruned}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera o cache de miniaturas de Database/Images.")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: nº de CPUs)")
+    parser.add_argument("--prune", action="store_true", help="remove miniaturas que não são mais usadas")
+    args = parser.parse_args(argv)
+    stats = build_all(workers=args.workers, prune=args.prune)
+    print("Miniaturas: {built} geradas, {cached} já em cache, {failed} com erro, {pruned} removidas.".format(**stats))
+    return 1 if stats["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
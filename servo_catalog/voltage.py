@@ -0,0 +1,72 @@
+"""
+Modelos tensão -> torque e tensão -> velocidade por servo.
+
+O catálogo traz até cinco pares (TensãoTorqueN, TorqueN) e
+(TensãoSpeedN, SpeedN). Na carga, os pares de cada servo são ordenados por
+tensão; a avaliação numa tensão de barramento é feita para o catálogo
+inteiro de uma vez:
+
+- dentro da faixa especificada: interpolação linear entre os pontos;
+- abaixo da menor tensão: escala proporcional à tensão (torque de stall e
+  velocidade em vazio de motor DC ~ V), o que é conservador;
+- acima da maior tensão: fica no valor da maior tensão (sobretensão não
+  rende crédito);
+- pares com valor mas sem tensão contam como constantes.
+"""
+import numpy as np
+
+class VoltageModel:
+    def __init__(self, volts, values):
+        volts = np.asarray(volts, dtype=float)
+        values = np.asarray(values, dtype=float)
+        has_value = ~np.isnan(values)
+        rated = has_value & ~np.isnan(volts)
+
+        # Ordena cada linha por tensão; pares inválidos (NaN) vão para o fim
+        key = np.where(rated, volts, np.inf)
+        order = np.argsort(key, axis=1, kind="stable")
+        self.volts = np.take_along_axis(np.where(rated, volts, np.nan), order, axis=1)
+        self.values = np.take_along_axis(np.where(rated, values, np.nan), order, axis=1)
+        self.n_points = rated.sum(axis=1)
+
+        # Sem nenhuma tensão informada: usa o maior valor como constante
+        unrated = ~rated.any(axis=1) & has_value.any(axis=1)
+        self.constant = np.full(len(values), np.nan)
+        if unrated.any():
+            self.constant[unrated] = np.nanmax(values[unrated], axis=1)
+
+    def at(self, voltage):
+        """Valor estimado de cada servo na tensão `voltage` (NaN = sem dados)."""
+        out = self.constant.copy()
+        rows = np.flatnonzero(self.n_points > 0)
+        if rows.size == 0:
+            return out
+
+        volts = self.volts[rows]
+        values = self.values[rows]
+        count = self.n_points[rows]
+
+        # k = quantos pontos têm tensão <= V (NaN compara como False)
+        k = (volts <= voltage).sum(axis=1)
+        last = count - 1
+        lo = np.clip(k - 1, 0, last)
+        hi = np.clip(k, 0, last)
+        r = np.arange(rows.size)
+        v_lo, v_hi = volts[r, lo], volts[r, hi]
+        y_lo, y_hi = values[r, lo], values[r, hi]
+
+        span = v_hi - v_lo
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(span > 0, (voltage - v_lo) / span, 0.0)
+        result = y_lo + t * (y_hi - y_lo)
+
+        below = k == 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result[below] = np.where(
+                volts[below, 0] > 0, values[below, 0] * voltage / volts[below, 0], values[below, 0]
+            )
+        above = k >= count
+        result[above] = values[r[above], last[above]]
+
+        out[rows] = result
+        return out